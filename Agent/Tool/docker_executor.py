@@ -0,0 +1,22 @@
+"""
+Docker command executor - The RAG API's tool layer, loaded from Rag-API/app/tools
+
+The executor, its result cache and the bounded command runner are kept in
+one place. Agent registers that directory as a package of its own instead
+of carrying a copy; it can't import it as `app.tools` because this
+directory's app.py shadows the RAG API's `app` package.
+"""
+import importlib.util
+import os
+import sys
+
+_TOOLS_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "Rag-API", "app", "tools"))
+_PACKAGE = "rag_api_tools"
+
+if _PACKAGE not in sys.modules:
+    _spec = importlib.util.spec_from_loader(_PACKAGE, loader=None, is_package=True)
+    _package = importlib.util.module_from_spec(_spec)
+    _package.__path__ = [_TOOLS_DIR]
+    sys.modules[_PACKAGE] = _package
+
+from rag_api_tools.docker_executor import DockerCommandExecutor, docker_executor  # noqa: E402,F401
@@ -15,13 +15,13 @@ from langgraph.prebuilt import create_react_agent
 from langchain.tools import tool
 from typing import Any, Dict
 from typing import List, Literal
-import subprocess
 
 
 # imports form files
 from vector_Store.faiss_index import build_faiss_index
 from config import FAISS_INDEX_DIR,OPENAI_API_KEY,embeddings
 from Parser.command_Parser import get_parser
+from Tool.docker_executor import docker_executor
 from Prompt.prompts import system_prompt,rag_prompt
 load_dotenv()
 
@@ -89,11 +89,9 @@ def run_command(cmd: str) -> str:
              Raises a RuntimeError if the command exits with a nonzero status.
     """
     print(f"\n[>] Executing: {cmd}")
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"Execution Failed:\n{result.stderr}")
-    print(f"Output:\n{result.stdout}")
-    return result.stdout
+    output = docker_executor.run(cmd)
+    print(f"Output:\n{output}")
+    return output
 
 
 ## Tool1 
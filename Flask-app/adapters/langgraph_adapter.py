@@ -1,8 +1,8 @@
 from typing import Dict, Any, List
 from core.registry import FrameworkAdapter
 from core.tracing import tracing_manager
+from services.rag_client import rag_api_client
 import time
-import requests
 
 class LangGraphAdapter(FrameworkAdapter):
     """LangGraph framework adapter"""
@@ -32,21 +32,12 @@ class LangGraphAdapter(FrameworkAdapter):
         
         try:
             # Make API call to RAG service
-            payload = {
-                "framework": "langgraph",
-                "llm_model": agent['model'],
-                "vector_store": agent['vector_store'],
-                "query": query
-            }
-            
-            response = requests.post(
-                "http://localhost:8000/ask",
-                json=payload,
-                timeout=30
+            result = rag_api_client.ask(
+                query,
+                framework="langgraph",
+                llm_model=agent['model'],
+                vector_store=agent['vector_store']
             )
-            response.raise_for_status()
-            
-            result = response.json()
             duration = time.time() - start_time
             
             return {
@@ -1,7 +1,7 @@
 from typing import Dict, Any, List
 from core.registry import FrameworkAdapter
+from services.rag_client import rag_api_client
 import time
-import requests
 
 class LlamaIndexAdapter(FrameworkAdapter):
     """LlamaIndex framework adapter"""
@@ -30,21 +30,12 @@ class LlamaIndexAdapter(FrameworkAdapter):
         start_time = time.time()
         
         try:
-            payload = {
-                "framework": "llamaindex",
-                "llm_model": agent['model'],
-                "vector_store": agent['vector_store'],
-                "query": query
-            }
-            
-            response = requests.post(
-                "http://localhost:8000/ask",
-                json=payload,
-                timeout=30
+            result = rag_api_client.ask(
+                query,
+                framework="llamaindex",
+                llm_model=agent['model'],
+                vector_store=agent['vector_store']
             )
-            response.raise_for_status()
-            
-            result = response.json()
             duration = time.time() - start_time
             
             return {
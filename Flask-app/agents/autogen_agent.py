@@ -1,25 +1,20 @@
-import requests
 from agents.base_agent import BaseDockerAgent
+from services.rag_client import rag_api_client, RAGAPIError
 
 class AutoGenDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.rag_api_url = "http://localhost:8000"
+        self.client = rag_api_client
     
     def run(self, query: str) -> str:
         try:
             # AutoGen implementation would go here
-            response = requests.post(
-                f"{self.rag_api_url}/ask",
-                json={
-                    "framework": "langgraph",  # Fallback to langgraph
-                    "llm_model": "gpt-4o-mini", 
-                    "vector_store": "faiss",
-                    "query": f"AutoGen Conversational: {query}"
-                },
-                timeout=30
+            result = self.client.ask(
+                f"AutoGen Conversational: {query}",
+                framework="langgraph",  # Fallback to langgraph
+                source="autogen"
             )
-            response.raise_for_status()
-            result = response.json()
             return f"AutoGen Conversational Response: {result.get('answer', 'No answer found')}"
+        except RAGAPIError:
+            raise
         except Exception as e:
             return f"AutoGen Error: {str(e)}"
\ No newline at end of file
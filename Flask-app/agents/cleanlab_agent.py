@@ -1,24 +1,19 @@
-import requests
 from agents.base_agent import BaseDockerAgent
+from services.rag_client import rag_api_client, RAGAPIError
 
 class CleanlabDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.rag_api_url = "http://localhost:8000"
+        self.client = rag_api_client
     
     def run(self, query: str) -> str:
         try:
-            response = requests.post(
-                f"{self.rag_api_url}/ask",
-                json={
-                    "framework": "langgraph",  # Fallback
-                    "llm_model": "gpt-4o-mini",
-                    "vector_store": "faiss",
-                    "query": f"Cleanlab Confidence-Scored: {query}"
-                },
-                timeout=30
+            result = self.client.ask(
+                f"Cleanlab Confidence-Scored: {query}",
+                framework="langgraph",  # Fallback
+                source="cleanlab"
             )
-            response.raise_for_status()
-            result = response.json()
             return f"Cleanlab Confidence-Scored Response: {result.get('answer', 'No answer found')}"
+        except RAGAPIError:
+            raise
         except Exception as e:
             return f"Cleanlab Error: {str(e)}"
\ No newline at end of file
@@ -1,26 +1,21 @@
-import requests
 from agents.base_agent import BaseDockerAgent
+from services.rag_client import rag_api_client, RAGAPIError
 
 class CrewAIDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.rag_api_url = "http://localhost:8000"
+        self.client = rag_api_client
     
     def run(self, query: str) -> str:
         try:
             # CrewAI implementation would go here
             # For now, using a placeholder that calls RAG API
-            response = requests.post(
-                f"{self.rag_api_url}/ask",
-                json={
-                    "framework": "langgraph",  # Fallback to langgraph
-                    "llm_model": "gpt-4o-mini",
-                    "vector_store": "faiss",
-                    "query": f"CrewAI Multi-Agent: {query}"
-                },
-                timeout=30
+            result = self.client.ask(
+                f"CrewAI Multi-Agent: {query}",
+                framework="langgraph",  # Fallback to langgraph
+                source="crewai"
             )
-            response.raise_for_status()
-            result = response.json()
             return f"CrewAI Multi-Agent Response: {result.get('answer', 'No answer found')}"
+        except RAGAPIError:
+            raise
         except Exception as e:
             return f"CrewAI Error: {str(e)}"
\ No newline at end of file
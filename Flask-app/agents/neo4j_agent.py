@@ -1,24 +1,19 @@
-import requests
 from agents.base_agent import BaseDockerAgent
+from services.rag_client import rag_api_client, RAGAPIError
 
 class Neo4jDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.rag_api_url = "http://localhost:8000"
+        self.client = rag_api_client
     
     def run(self, query: str) -> str:
         try:
-            response = requests.post(
-                f"{self.rag_api_url}/ask",
-                json={
-                    "framework": "langgraph",  # Fallback
-                    "llm_model": "gpt-4o-mini",
-                    "vector_store": "faiss",
-                    "query": f"Neo4j Graph RAG: {query}"
-                },
-                timeout=30
+            result = self.client.ask(
+                f"Neo4j Graph RAG: {query}",
+                framework="langgraph",  # Fallback
+                source="neo4j"
             )
-            response.raise_for_status()
-            result = response.json()
             return f"Neo4j Graph RAG Response: {result.get('answer', 'No answer found')}"
+        except RAGAPIError:
+            raise
         except Exception as e:
             return f"Neo4j Error: {str(e)}"
\ No newline at end of file
@@ -1,24 +1,19 @@
-import requests
 from agents.base_agent import BaseDockerAgent
+from services.rag_client import rag_api_client, RAGAPIError
 
 class OpenAIDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.rag_api_url = "http://localhost:8000"
+        self.client = rag_api_client
     
     def run(self, query: str) -> str:
         try:
-            response = requests.post(
-                f"{self.rag_api_url}/ask",
-                json={
-                    "framework": "langgraph",  # Use langgraph as backend
-                    "llm_model": "gpt-4o-mini",
-                    "vector_store": "faiss",
-                    "query": f"OpenAI Direct: {query}"
-                },
-                timeout=30
+            result = self.client.ask(
+                f"OpenAI Direct: {query}",
+                framework="langgraph",  # Use langgraph as backend
+                source="openai"
             )
-            response.raise_for_status()
-            result = response.json()
             return f"OpenAI Direct Response: {result.get('answer', 'No answer found')}"
+        except RAGAPIError:
+            raise
         except Exception as e:
             return f"OpenAI Error: {str(e)}"
\ No newline at end of file
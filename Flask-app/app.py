@@ -3,6 +3,8 @@ from config.settings import settings
 from core.tracing import tracing_manager
 from routes.web import web_bp
 from routes.api import api_bp
+from services.framework_manager import framework_manager
+from services.health_scheduler import health_scheduler
 import structlog
 import os
 
@@ -36,6 +38,14 @@ def create_app():
     def health():
         return {'status': 'healthy', 'service': 'docker-agent'}
     
+    # Import framework SDKs in the background instead of blocking startup
+    if settings.FRAMEWORK_WARMUP:
+        framework_manager.warmup()
+    
+    # Probe frameworks on a schedule; health endpoints serve the cached snapshot
+    if settings.HEALTH_CHECK_ENABLED:
+        health_scheduler.start()
+    
     logger.info("Flask application created successfully")
     return app
 
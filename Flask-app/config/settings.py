@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import Optional, List
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     # Application Settings
@@ -11,6 +11,113 @@ class Settings(BaseSettings):
     
     # API Settings
     RAG_API_URL: str = "http://localhost:8000"
+    RAG_API_CONNECT_TIMEOUT: float = 3.05
+    RAG_API_READ_TIMEOUT: float = 30.0
+    RAG_API_MAX_RETRIES: int = 2
+    RAG_API_BACKOFF_BASE: float = 0.25
+    RAG_API_POOL_SIZE: int = 20
+    
+    # Async Job Settings
+    JOB_MAX_WORKERS: int = 8
+    JOB_QUEUE_SIZE: int = 64
+    JOB_CALLBACK_TIMEOUT: float = 10.0
+    # Hosts job callbacks may target even if they resolve to private addresses;
+    # any other host must resolve to public addresses only
+    JOB_CALLBACK_ALLOWED_HOSTS: List[str] = []
+    JOB_EVENTS_POLL_INTERVAL: float = 0.5
+    
+    # Multi-framework comparisons
+    COMPARE_MAX_WORKERS: int = 16
+    COMPARE_MAX_RUNS: int = 45
+    COMPARE_RUN_TIMEOUT: float = 60.0
+    
+    # Response cache in front of the framework call
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: float = 300.0
+    # Answers about live container state (docker ps, logs, "what is running") expire much sooner
+    RESPONSE_CACHE_LIVE_STATE_TTL: float = 5.0
+    RESPONSE_CACHE_MAX_ENTRIES: int = 512
+    RESPONSE_CACHE_DISK_ENABLED: bool = False
+    # Docker subcommands whose answers depend on side effects; never cached
+    RESPONSE_CACHE_BYPASS_COMMANDS: List[str] = [
+        "run", "exec", "start", "stop", "restart", "kill", "rm", "rmi",
+        "create", "build", "pull", "push", "prune", "pause", "unpause",
+        "update", "rename", "commit", "tag", "login", "logout", "compose",
+        "up", "down"
+    ]
+    # Natural-language verbs that ask the agent to change something; never cached
+    RESPONSE_CACHE_MUTATING_VERBS: List[str] = [
+        "run", "exec", "execute", "start", "stop", "restart", "kill", "remove", "rm",
+        "delete", "destroy", "create", "build", "rebuild", "pull", "push", "prune",
+        "clean", "cleanup", "pause", "unpause", "update", "upgrade", "rename", "commit",
+        "tag", "login", "logout", "deploy", "launch", "spin", "scale", "install",
+        "uninstall", "mount", "attach", "detach", "connect", "disconnect", "purge", "wipe",
+        "reset", "shutdown", "terminate", "set", "change", "modify", "edit", "copy", "cp",
+        "move", "save", "load", "import", "export", "up", "down"
+    ]
+    # Only queries that read as questions or lookups are cached; anything else runs every time
+    RESPONSE_CACHE_READ_ONLY_PREFIXES: List[str] = [
+        "what", "why", "how", "when", "which", "who", "where", "is", "are", "does", "do",
+        "can", "should", "explain", "describe", "define", "compare", "difference",
+        "list", "show", "display", "inspect", "get", "check", "tell", "docker ps",
+        "docker images", "docker info", "docker version", "docker inspect"
+    ]
+    
+    # Identical concurrent requests share one execution
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_WAIT_TIMEOUT: float = 90.0
+    
+    # End-to-end deadline per priority class, in seconds
+    REQUEST_TIMEOUTS: Dict[str, float] = {
+        "interactive": 60.0, "api": 120.0, "batch": 300.0
+    }
+    
+    # Per-framework bulkheads
+    FRAMEWORK_MAX_CONCURRENCY: int = 4
+    FRAMEWORK_MAX_QUEUE: int = 16
+    FRAMEWORK_QUEUE_TIMEOUT: float = 15.0
+    # Batch work may only fill this share of a framework queue
+    FRAMEWORK_BATCH_QUEUE_SHARE: float = 0.5
+    FRAMEWORK_CONCURRENCY_OVERRIDES: Dict[str, int] = {
+        "crewai": 2, "cleanlab": 2
+    }
+    
+    # Frameworks load lazily; warmup imports them in the background at startup
+    FRAMEWORK_WARMUP: bool = True
+    FRAMEWORK_WARMUP_WORKERS: int = 4
+    
+    # Background framework health checks
+    HEALTH_CHECK_ENABLED: bool = True
+    HEALTH_CHECK_INTERVAL: float = 60.0
+    HEALTH_CHECK_TTL: float = 180.0
+    HEALTH_PROBE_TIMEOUT: float = 20.0
+    HEALTH_PROBE_WORKERS: int = 8
+    
+    # Circuit breakers and adaptive timeouts, per framework and model
+    CIRCUIT_WINDOW_SECONDS: float = 60.0
+    CIRCUIT_MIN_REQUESTS: int = 5
+    CIRCUIT_ERROR_THRESHOLD: float = 0.5
+    CIRCUIT_OPEN_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_PROBES: int = 1
+    ADAPTIVE_TIMEOUT_MULTIPLIER: float = 1.5
+    ADAPTIVE_TIMEOUT_MIN: float = 5.0
+    ADAPTIVE_TIMEOUT_MAX: float = 60.0
+    
+    # Opt-in request hedging across frameworks backed by the same RAG pipeline
+    HEDGE_BUDGET_RATIO: float = 0.05
+    HEDGE_BUDGET_BURST: float = 10.0
+    HEDGE_GROUPS: List[List[str]] = [
+        ["langgraph", "openai", "vercel", "litellm"]
+    ]
+    
+    # "auto" framework routing; an empty candidate list means every registered framework
+    ROUTER_CANDIDATES: List[str] = []
+    ROUTER_EWMA_ALPHA: float = 0.2
+    ROUTER_EXPLORATION_RATE: float = 0.1
+    ROUTER_TAIL_WEIGHT: float = 0.5
+    ROUTER_COST_WEIGHT: float = 100.0
+    ROUTER_PRIOR_LATENCY: float = 5.0
+    ROUTER_STATS_WINDOW_HOURS: int = 1
     
     # Database Settings
     DATABASE_URL: Optional[str] = None
@@ -0,0 +1,88 @@
+"""
+Request context - Priority class and absolute deadline carried with each agent request
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional
+
+from config.settings import settings
+
+# Lower value is served first
+PRIORITIES = {
+    'interactive': 0,
+    'api': 1,
+    'batch': 2
+}
+DEFAULT_PRIORITY = 'api'
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's deadline passes before its work starts"""
+    pass
+
+
+class RequestContext:
+    """Priority and deadline of the request currently being served"""
+
+    def __init__(self, priority: str = DEFAULT_PRIORITY, deadline: Optional[float] = None):
+        self.priority = priority if priority in PRIORITIES else DEFAULT_PRIORITY
+        self.deadline = deadline or time.time() + settings.REQUEST_TIMEOUTS[self.priority]
+        # Details reported by downstream calls, surfaced in the request's trace
+        self.annotations: Dict[str, List[Any]] = {}
+        # Framework whose run this context belongs to, set per framework call
+        self.framework: Optional[str] = None
+
+    @classmethod
+    def from_request(cls, request_data: Dict[str, Any]) -> 'RequestContext':
+        """Build the context from the 'priority' and absolute 'deadline' fields of a request"""
+        deadline = request_data.get('deadline')
+        return cls(
+            priority=request_data.get('priority', DEFAULT_PRIORITY),
+            deadline=float(deadline) if deadline else None
+        )
+
+    def for_framework(self, framework: str, deadline: float) -> 'RequestContext':
+        """Context for one framework call of this request: deadline no later than `deadline`, shared annotations"""
+        child = RequestContext(self.priority, min(self.deadline, deadline))
+        child.annotations = self.annotations
+        child.framework = framework
+        return child
+
+    @property
+    def rank(self) -> int:
+        return PRIORITIES[self.priority]
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline"""
+        return self.deadline - time.time()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, stage: str):
+        """Raise DeadlineExceeded if the deadline has passed"""
+        if self.expired():
+            raise DeadlineExceeded(f"Deadline exceeded {-self.remaining():.1f}s before {stage}")
+
+    def annotate(self, key: str, values: List[Any]):
+        """Append downstream details under `key`"""
+        self.annotations.setdefault(key, []).extend(values)
+
+
+_current_context: ContextVar[Optional[RequestContext]] = ContextVar('request_context', default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Context of the request being served on this thread, if any"""
+    return _current_context.get()
+
+
+@contextmanager
+def use_request_context(context: RequestContext):
+    """Make `context` current for the duration of the block"""
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
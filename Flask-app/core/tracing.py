@@ -86,7 +86,7 @@ class TracingManager:
         except Exception as e:
             logger.error("Failed to start Prometheus server", error=str(e))
     
-    def start_trace(self, request_data: Dict[str, Any]) -> str:
+    def start_trace(self, request_data: Dict[str, Any], status: str = 'started') -> str:
         """Start a new trace for a request"""
         trace_id = str(uuid.uuid4())
         
@@ -95,7 +95,7 @@ class TracingManager:
             'session_id': self.session_id,
             'timestamp': datetime.utcnow().isoformat(),
             'request_data': request_data,
-            'status': 'started',
+            'status': status,
             'steps': [],
             'metrics': {
                 'start_time': time.time(),
@@ -122,6 +122,26 @@ class TracingManager:
         
         return trace_id
     
+    def set_status(self, trace_id: str, status: str):
+        """Update the status of an in-flight trace"""
+        try:
+            trace = db_manager.get_trace_by_id(trace_id)
+            if trace:
+                trace['status'] = status
+                db_manager.save_trace(trace)
+        except Exception as e:
+            logger.error(f"Failed to set status on trace {trace_id}: {e}")
+    
+    def set_framework(self, trace_id: str, framework: str):
+        """Record the framework that actually served a routed trace"""
+        try:
+            trace = db_manager.get_trace_by_id(trace_id)
+            if trace:
+                trace['framework'] = framework
+                db_manager.save_trace(trace)
+        except Exception as e:
+            logger.error(f"Failed to set framework on trace {trace_id}: {e}")
+    
     def add_step(self, trace_id: str, step_name: str, step_data: Dict[str, Any]):
         """Add a step to an existing trace"""
         try:
@@ -165,29 +185,32 @@ class TracingManager:
             logger.error(f"Failed to add step to trace {trace_id}: {e}")
     
     def end_trace(self, trace_id: str, status: str = 'completed', 
-                  response: str = '', error: Optional[str] = None):
-        """End a trace and record metrics"""
+                  response: str = '', error: Optional[str] = None,
+                  token_data: Optional[Dict[str, Any]] = None):
+        """End a trace and record metrics; token_data overrides the estimate from the response"""
         try:
             trace = db_manager.get_trace_by_id(trace_id)
             if trace:
                 end_time = time.time()
                 duration = end_time - trace['metrics']['start_time']
                 
-                # Calculate tokens and costs
-                query = trace.get('query', '')
-                model = trace.get('model', 'gpt-4o-mini')
-                
-                # Try to extract actual tokens from response
-                actual_input, actual_output = token_calculator.extract_tokens_from_response(response)
-                
-                # Calculate tokens and costs
-                token_data = token_calculator.calculate_tokens_and_cost(
-                    query=query,
-                    response=response,
-                    model=model,
-                    actual_input_tokens=actual_input,
-                    actual_output_tokens=actual_output
-                )
+                if token_data is None:
+                    # Calculate tokens and costs
+                    query = trace.get('query', '')
+                    model = trace.get('model', 'gpt-4o-mini')
+                    
+                    # Try to extract actual tokens from response
+                    actual_input, actual_output = token_calculator.extract_tokens_from_response(response)
+                    
+                    # Calculate tokens and costs
+                    token_data = token_calculator.calculate_tokens_and_cost(
+                        query=query,
+                        response=response,
+                        model=model,
+                        actual_input_tokens=actual_input,
+                        actual_output_tokens=actual_output,
+                        actual_source='response'
+                    )
                 
                 # Update trace
                 trace.update({
@@ -204,6 +227,9 @@ class TracingManager:
                     'error_message': error
                 })
                 
+                # No column of its own; kept with the trace's other metrics
+                trace['metrics']['token_source'] = token_data.get('token_source', 'estimated')
+                
                 # Save trace
                 db_manager.save_trace(trace)
                 
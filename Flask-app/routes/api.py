@@ -1,9 +1,15 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
 from services.agent_service import agent_service
+from services.job_service import job_service, JobQueueFull, InvalidCallbackURL
+from services.comparison_service import comparison_service
 from services.enhanced_metrics_service import enhanced_metrics_service
 from services.framework_manager import framework_manager
+from services.health_scheduler import health_scheduler
+from services.circuit_breaker import circuit_breakers
+from services.router import framework_router
 from core.tracing import tracing_manager
 import structlog
+import time
 
 logger = structlog.get_logger()
 
@@ -24,15 +30,112 @@ def generate():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        # Interactive priority is reserved for the playground
+        if data.get('priority') not in ('api', 'batch'):
+            data['priority'] = 'api'
+        if data.get('timeout'):
+            data['deadline'] = time.time() + float(data['timeout'])
+        
+        # Async mode: queue the query and return the trace ID straight away
+        if data.get('async') or request.args.get('mode') == 'async':
+            try:
+                trace_id = job_service.submit(data)
+            except JobQueueFull as e:
+                return jsonify({'error': str(e)}), 429, {'Retry-After': '5'}
+            except InvalidCallbackURL as e:
+                return jsonify({'error': str(e)}), 400
+            
+            return jsonify({
+                'trace_id': trace_id,
+                'status': 'queued',
+                'status_url': url_for('api.get_job', trace_id=trace_id),
+                'events_url': url_for('api.get_job_events', trace_id=trace_id)
+            }), 202
+        
         # Execute query
         result = agent_service.execute_query(data)
         
+        if result.get('status') == 'rejected':
+            return jsonify(result), 429, {'Retry-After': str(result.get('retry_after', 1))}
+        if result.get('status') == 'timeout':
+            return jsonify(result), 504
+        
         return jsonify(result)
         
     except Exception as e:
         logger.error("API generate error", error=str(e))
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/jobs/<trace_id>', methods=['GET'])
+def get_job(trace_id):
+    """Get async job status and result"""
+    try:
+        job = job_service.get_job(trace_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        return jsonify(job)
+    except Exception as e:
+        logger.error("API job error", error=str(e), trace_id=trace_id)
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/jobs/<trace_id>/events', methods=['GET'])
+def get_job_events(trace_id):
+    """Stream async job status changes as Server-Sent Events"""
+    return Response(
+        stream_with_context(job_service.stream_events(trace_id)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api_bp.route('/compare', methods=['POST'])
+def compare():
+    """Run one query against several frameworks and models concurrently"""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        if not data.get('query'):
+            return jsonify({'error': 'Missing required field: query'}), 400
+        
+        try:
+            runs = comparison_service.plan_runs(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        comparison_id = comparison_service.new_comparison_id()
+        
+        # Stream each result as it completes
+        if data.get('stream') or 'text/event-stream' in request.headers.get('Accept', ''):
+            return Response(
+                stream_with_context(comparison_service.stream(data, runs, comparison_id)),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+        
+        results = list(comparison_service.run(data, runs, comparison_id))
+        return jsonify({
+            'comparison_id': comparison_id,
+            'results': results,
+            'summary': comparison_service.summarize(comparison_id, results)
+        })
+        
+    except Exception as e:
+        logger.error("API compare error", error=str(e))
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/compare/<comparison_id>', methods=['GET'])
+def get_comparison(comparison_id):
+    """Get a past comparison from its traces"""
+    try:
+        comparison = comparison_service.get_comparison(comparison_id)
+        if not comparison:
+            return jsonify({'error': 'Comparison not found'}), 404
+        return jsonify(comparison)
+    except Exception as e:
+        logger.error("API comparison error", error=str(e), comparison_id=comparison_id)
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/configurations', methods=['GET'])
 def get_configurations():
     """Get available configurations"""
@@ -53,12 +156,32 @@ def get_framework_health():
         logger.error("API framework health error", error=str(e))
         return jsonify({'error': str(e)}), 500
 
+@api_bp.route('/frameworks/circuits', methods=['GET'])
+def get_framework_circuits():
+    """Get circuit breaker state per framework and model"""
+    try:
+        return jsonify(circuit_breakers.snapshot())
+    except Exception as e:
+        logger.error("API framework circuits error", error=str(e))
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/frameworks/routing', methods=['GET'])
+def get_framework_routing():
+    """Get the moving averages used by auto routing"""
+    try:
+        return jsonify(framework_router.get_stats())
+    except Exception as e:
+        logger.error("API framework routing error", error=str(e))
+        return jsonify({'error': str(e)}), 500
+
 @api_bp.route('/frameworks/test/<framework_name>', methods=['POST'])
 def test_framework(framework_name):
     """Test a specific framework"""
     try:
         test_query = request.json.get('query', 'docker version')
         result = framework_manager.execute_query(framework_name, test_query)
+        if result.get('status') == 'rejected':
+            return jsonify(result), 429, {'Retry-After': str(result.get('retry_after', 1))}
         return jsonify(result)
     except Exception as e:
         logger.error("API framework test error", error=str(e), framework=framework_name)
@@ -190,8 +313,8 @@ def cleanup_metrics():
 def health_check():
     """Health check endpoint"""
     try:
-        # Check framework health
-        framework_health = framework_manager.health_check()
+        # Cached framework health from the background scheduler
+        framework_health = health_scheduler.get_snapshot()
         
         # Count healthy frameworks
         healthy_count = sum(1 for h in framework_health.values() if h.get('status') == 'healthy')
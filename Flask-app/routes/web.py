@@ -1,5 +1,6 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from services.agent_service import agent_service
+from services.job_service import job_service, JobQueueFull
 from services.enhanced_metrics_service import enhanced_metrics_service
 from core.tracing import tracing_manager
 from config.settings import settings
@@ -45,9 +46,21 @@ def generate():
             'framework': framework,
             'model': model,
             'vector_store': vector_store,
-            'query': query
+            'query': query,
+            'priority': 'interactive'
         }
         
+        # Background mode: queue the query and follow it on the trace page
+        if request.form.get('async_mode'):
+            try:
+                trace_id = job_service.submit(request_data)
+            except JobQueueFull:
+                flash('Server is busy, please try again shortly', 'error')
+                return redirect(url_for('web.index'))
+            
+            flash('Query queued; this page shows its progress', 'info')
+            return redirect(url_for('web.trace_detail', trace_id=trace_id))
+        
         # Execute query
         result = agent_service.execute_query(request_data)
         
@@ -1,9 +1,14 @@
 from typing import Dict, Any, Optional
 from core.tracing import tracing_manager
+from core.request_context import RequestContext, use_request_context, get_request_context
 from config.settings import settings
 from .enhanced_metrics_service import enhanced_metrics_service
 from .token_calculator import token_calculator
 from .framework_manager import framework_manager
+from .health_scheduler import health_scheduler
+from .router import framework_router, AUTO_FRAMEWORK
+from .response_cache import response_cache, fingerprint, is_cacheable, is_mutating, cache_ttl, RESPONSE_CACHE_REQUESTS
+from .single_flight import single_flight, Flight, COALESCED_REQUESTS
 import structlog
 import time
 import re
@@ -16,10 +21,30 @@ class AgentService:
     def __init__(self):
         self.framework_manager = framework_manager
     
-    def execute_query(self, request_data: Dict[str, Any]) -> Dict[str, Any]:
+    def execute_query(self, request_data: Dict[str, Any], trace_id: Optional[str] = None) -> Dict[str, Any]:
         """Execute a query with full tracing and persistent metrics collection"""
-        trace_id = tracing_manager.start_trace(request_data)
+        # A request that may change Docker state voids every cached answer, before it
+        # runs and again once it has, so answers read while it ran aren't kept either
+        mutating = is_mutating(request_data.get('query', ''))
+        if mutating:
+            response_cache.invalidate()
+        try:
+            # Priority and deadline follow the request down to the RAG API call
+            with use_request_context(RequestContext.from_request(request_data)):
+                return self._execute_query(request_data, trace_id)
+        finally:
+            if mutating:
+                response_cache.invalidate()
+    
+    def _execute_query(self, request_data: Dict[str, Any], trace_id: Optional[str] = None) -> Dict[str, Any]:
+        if trace_id:
+            # Trace was opened when the job was queued
+            tracing_manager.set_status(trace_id, 'running')
+        else:
+            trace_id = tracing_manager.start_trace(request_data)
         start_time = time.time()
+        cache_key = flight = None
+        cache_generation = response_cache.generation
         
         try:
             framework_name = request_data.get('framework', '').lower()
@@ -27,6 +52,27 @@ class AgentService:
             vector_store = request_data.get('vector_store', 'faiss')
             query = request_data.get('query', '')
             
+            if is_cacheable(request_data):
+                cache_key = fingerprint(framework_name, model, vector_store, query)
+                cached, tier = response_cache.get(cache_key)
+                if cached:
+                    return self._serve_cached(trace_id, request_data, cached, tier, start_time)
+                
+                if settings.SINGLE_FLIGHT_ENABLED:
+                    flight, is_leader = single_flight.join(cache_key, trace_id)
+                    if not is_leader:
+                        return self._serve_coalesced(trace_id, request_data, flight, start_time)
+            else:
+                RESPONSE_CACHE_REQUESTS.labels(result='bypass').inc()
+            
+            if framework_name == AUTO_FRAMEWORK:
+                decision = framework_router.choose(model)
+                if not decision:
+                    raise RuntimeError("No healthy framework available for auto routing")
+                framework_name = decision['framework']
+                tracing_manager.set_framework(trace_id, framework_name)
+                tracing_manager.add_step(trace_id, 'routing_decision', decision)
+            
             tracing_manager.add_step(trace_id, 'framework_initialization', {
                 'framework': framework_name,
                 'model': model,
@@ -34,7 +80,9 @@ class AgentService:
             })
             
             # Execute query using framework manager
-            result = self.framework_manager.execute_query(framework_name, query)
+            result = self.framework_manager.execute_query(
+                framework_name, query, model=model, hedge=bool(request_data.get('hedge'))
+            )
             
             end_time = time.time()
             duration = end_time - start_time
@@ -43,8 +91,18 @@ class AgentService:
             raw_response = result.get('answer', '')
             cleaned_response = self._clean_response(raw_response)
             
-            # Try to extract actual token counts from the response
-            actual_input_tokens, actual_output_tokens = token_calculator.extract_tokens_from_response(raw_response)
+            # Prefer the usage the providers reported for every LLM call of the run
+            # (system prompt, retrieved context and tool turns included); fall back
+            # to counts mentioned in the response, then to estimating query/answer.
+            # A hedged request is priced from the call that served the answer
+            served_by = result.get('served_by', framework_name)
+            llm_usage = [record['usage'] for record in get_request_context().annotations.get('llm_usage', [])
+                         if record['source'] == served_by]
+            actual_input_tokens, actual_output_tokens = token_calculator.extract_provider_usage(llm_usage)
+            actual_source = 'provider'
+            if actual_input_tokens is None:
+                actual_source = 'response'
+                actual_input_tokens, actual_output_tokens = token_calculator.extract_tokens_from_response(raw_response)
             
             # Calculate accurate tokens and costs
             token_data = token_calculator.calculate_tokens_and_cost(
@@ -52,7 +110,8 @@ class AgentService:
                 response=cleaned_response,
                 model=model,
                 actual_input_tokens=actual_input_tokens,
-                actual_output_tokens=actual_output_tokens
+                actual_output_tokens=actual_output_tokens,
+                actual_source=actual_source
             )
             
             tracing_manager.add_step(trace_id, 'query_execution', {
@@ -65,6 +124,8 @@ class AgentService:
                 'input_cost': token_data['input_cost'],
                 'output_cost': token_data['output_cost'],
                 'total_cost': token_data['total_cost'],
+                'token_source': token_data['token_source'],
+                'llm_calls': sum(usage.get('calls', 0) for usage in llm_usage),
                 'status': result.get('status', 'completed')
             })
             
@@ -81,11 +142,48 @@ class AgentService:
                 'input_cost': token_data['input_cost'],
                 'output_cost': token_data['output_cost'],
                 'total_cost': token_data['total_cost'],
-                'status': result.get('status', 'success')
+                'token_source': token_data['token_source'],
+                'status': result.get('status', 'success'),
+                'cache_hit': False
             }
+            if 'retry_after' in result:
+                final_result['retry_after'] = result['retry_after']
+            truncated_outputs = get_request_context().annotations.get('truncated_outputs')
+            if truncated_outputs:
+                final_result['output_truncated'] = True
+                tracing_manager.add_step(trace_id, 'tool_output_truncated', {
+                    'count': len(truncated_outputs),
+                    'outputs': truncated_outputs
+                })
+            if result.get('hedged'):
+                final_result['hedged'] = True
+                final_result['served_by'] = result['served_by']
+                tracing_manager.add_step(trace_id, 'hedge', {
+                    'primary': framework_name,
+                    'served_by': result['served_by']
+                })
+            
+            if result.get('status') != 'rejected':
+                # Credit the framework that actually answered; a hedged primary lost, i.e. it was too slow
+                framework_router.record(
+                    served_by,
+                    result.get('duration', duration),
+                    result.get('status') == 'success',
+                    token_data['total_cost']
+                )
+                if result.get('hedged'):
+                    framework_router.record(framework_name, result.get('duration', duration), False, 0.0)
+            
+            if cache_key and result.get('status') == 'success':
+                response_cache.set(cache_key, {
+                    'answer': cleaned_response,
+                    'framework': framework_name,
+                    'trace_id': trace_id
+                }, generation=cache_generation, ttl=cache_ttl(query))
             
             # End trace with response and token data
-            tracing_manager.end_trace(trace_id, result.get('status', 'completed'), cleaned_response)
+            tracing_manager.end_trace(trace_id, result.get('status', 'completed'), cleaned_response,
+                                     token_data=token_data)
             
             logger.info(
                 "Query executed successfully",
@@ -97,6 +195,9 @@ class AgentService:
                 cost=token_data['total_cost']
             )
             
+            if flight:
+                single_flight.complete(cache_key, flight, final_result)
+            
             return final_result
             
         except Exception as e:
@@ -105,6 +206,9 @@ class AgentService:
             
             error_message = str(e)
             
+            if flight and flight.leader_trace_id == trace_id:
+                single_flight.complete(cache_key, flight, error=error_message)
+            
             # Calculate tokens for failed request (query only)
             model = request_data.get('model', 'gpt-4o-mini')
             query = request_data.get('query', '')
@@ -144,6 +248,97 @@ class AgentService:
                 'error': error_message
             }
     
+    def _serve_cached(self, trace_id: str, request_data: Dict[str, Any],
+                      cached: Dict[str, Any], tier: str, start_time: float) -> Dict[str, Any]:
+        """Answer from the response cache; no framework or LLM call is made"""
+        duration = time.time() - start_time
+        token_data = {
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'total_tokens': 0,
+            'input_cost': 0.0,
+            'output_cost': 0.0,
+            'total_cost': 0.0
+        }
+        
+        if cached['framework'] != request_data.get('framework', '').lower():
+            # An auto-routed request; attribute it to the framework that produced the answer
+            tracing_manager.set_framework(trace_id, cached['framework'])
+        
+        tracing_manager.add_step(trace_id, 'cache_hit', {
+            'tier': tier,
+            'source_trace_id': cached['trace_id'],
+            'age': time.time() - cached['cached_at'],
+            'duration': duration
+        })
+        tracing_manager.end_trace(trace_id, 'success', cached['answer'], token_data=token_data)
+        
+        logger.info("Query served from cache", trace_id=trace_id, tier=tier, source_trace_id=cached['trace_id'])
+        
+        return {
+            'answer': cached['answer'],
+            'trace_id': trace_id,
+            'framework': cached['framework'],
+            'model': request_data.get('model', 'gpt-4o-mini'),
+            'vector_store': request_data.get('vector_store', 'faiss'),
+            'duration': duration,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'tokens_used': 0,
+            'input_cost': 0.0,
+            'output_cost': 0.0,
+            'total_cost': 0.0,
+            'status': 'success',
+            'cache_hit': True,
+            'cached_trace_id': cached['trace_id']
+        }
+    
+    def _serve_coalesced(self, trace_id: str, request_data: Dict[str, Any],
+                         flight: Flight, start_time: float) -> Dict[str, Any]:
+        """Wait for an identical in-flight request and reuse its answer"""
+        wait_timeout = min(settings.SINGLE_FLIGHT_WAIT_TIMEOUT, max(0.0, get_request_context().remaining()))
+        if not flight.wait(wait_timeout):
+            raise TimeoutError(f"Coalesced request {flight.leader_trace_id} did not finish")
+        if flight.error:
+            raise RuntimeError(flight.error)
+        
+        leader = flight.result
+        duration = time.time() - start_time
+        COALESCED_REQUESTS.labels(framework=leader['framework']).inc()
+        
+        if leader['framework'] != request_data.get('framework', '').lower():
+            tracing_manager.set_framework(trace_id, leader['framework'])
+        
+        tracing_manager.add_step(trace_id, 'coalesced', {
+            'leader_trace_id': flight.leader_trace_id,
+            'duration': duration
+        })
+        # The leader's trace carries the LLM usage
+        tracing_manager.end_trace(trace_id, leader['status'], leader['answer'], token_data={
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'total_tokens': 0,
+            'input_cost': 0.0,
+            'output_cost': 0.0,
+            'total_cost': 0.0
+        })
+        
+        logger.info("Query coalesced", trace_id=trace_id, leader_trace_id=flight.leader_trace_id)
+        
+        return dict(
+            leader,
+            trace_id=trace_id,
+            duration=duration,
+            input_tokens=0,
+            output_tokens=0,
+            tokens_used=0,
+            input_cost=0.0,
+            output_cost=0.0,
+            total_cost=0.0,
+            coalesced=True,
+            leader_trace_id=flight.leader_trace_id
+        )
+    
     def _clean_response(self, text: str) -> str:
         """Clean and format the response"""
         if not text:
@@ -174,14 +369,14 @@ class AgentService:
         available_frameworks = list(self.framework_manager.get_available_frameworks().keys())
         
         return {
-            'frameworks': available_frameworks,
+            'frameworks': available_frameworks + [AUTO_FRAMEWORK],
             'models': settings.MODELS,
             'vector_stores': settings.VECTORSTORES
         }
     
     def get_framework_health(self) -> Dict[str, Any]:
-        """Get health status of all frameworks"""
-        return self.framework_manager.health_check()
+        """Get cached health status of all frameworks"""
+        return health_scheduler.get_snapshot()
 
 # Global service instance
 agent_service = AgentService()
\ No newline at end of file
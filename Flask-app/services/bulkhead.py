@@ -0,0 +1,162 @@
+"""
+Bulkhead - Bounded, priority-aware worker pool with admission control for a single framework
+"""
+import contextvars
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from config.settings import settings
+from core.request_context import get_request_context, DeadlineExceeded, PRIORITIES, DEFAULT_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+BULKHEAD_QUEUE_DEPTH = Gauge(
+    'docker_agent_framework_queue_depth',
+    'Requests waiting for a framework worker',
+    ['framework']
+)
+
+BULKHEAD_ACTIVE = Gauge(
+    'docker_agent_framework_active_workers',
+    'Framework workers currently executing a request',
+    ['framework']
+)
+
+BULKHEAD_WAIT_TIME = Histogram(
+    'docker_agent_framework_queue_wait_seconds',
+    'Time requests spent queued before a framework worker picked them up',
+    ['framework', 'priority']
+)
+
+BULKHEAD_REJECTIONS = Counter(
+    'docker_agent_framework_rejections_total',
+    'Requests shed by framework admission control',
+    ['framework', 'reason']
+)
+
+
+class BulkheadRejected(Exception):
+    """Raised when a framework cannot accept or start a request in time"""
+
+    def __init__(self, framework: str, reason: str, retry_after: int):
+        super().__init__(f"Framework '{framework}' is overloaded ({reason})")
+        self.framework = framework
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """Fixed set of worker threads in front of one framework with a bounded priority queue"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, queue_timeout: float,
+                 batch_queue_share: Optional[float] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        share = settings.FRAMEWORK_BATCH_QUEUE_SHARE if batch_queue_share is None else batch_queue_share
+        # Keep queue room for interactive and API traffic
+        self.batch_limit = max(1, int(max_queue * share))
+        self._queue = queue.PriorityQueue(maxsize=max_queue)
+        # Tie-breaker so requests of the same priority stay FIFO
+        self._sequence = itertools.count()
+        self._workers = []
+        self._lock = threading.Lock()
+
+    def _ensure_workers(self):
+        """Start worker threads on first use and replace any that have died"""
+        with self._lock:
+            self._workers = [worker for worker in self._workers if worker.is_alive()]
+            while len(self._workers) < self.max_workers:
+                worker = threading.Thread(
+                    target=self._worker,
+                    name=f"bulkhead-{self.name}-{len(self._workers)}",
+                    daemon=True
+                )
+                worker.start()
+                self._workers.append(worker)
+
+    def _retry_after(self) -> int:
+        """Rough seconds until a queue slot frees up"""
+        return max(1, int(self.queue_timeout))
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queue work at the current request's priority or raise BulkheadRejected if there is no room"""
+        self._ensure_workers()
+
+        request_context = get_request_context()
+        priority = request_context.priority if request_context else DEFAULT_PRIORITY
+
+        if priority == 'batch' and self._queue.qsize() >= self.batch_limit:
+            BULKHEAD_REJECTIONS.labels(framework=self.name, reason='batch_limit').inc()
+            raise BulkheadRejected(self.name, 'batch_limit', self._retry_after())
+
+        future = Future()
+        # Workers run fn inside the caller's context so the request context follows it
+        item = (PRIORITIES[priority], next(self._sequence), time.time(), future,
+                contextvars.copy_context(), fn, args, kwargs)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            BULKHEAD_REJECTIONS.labels(framework=self.name, reason='queue_full').inc()
+            raise BulkheadRejected(self.name, 'queue_full', self._retry_after())
+
+        BULKHEAD_QUEUE_DEPTH.labels(framework=self.name).set(self._queue.qsize())
+        return future
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                self._handle(item)
+            except Exception:
+                # A worker must never exit, or the pool silently shrinks
+                logger.exception(f"Bulkhead {self.name} worker failed to handle a request")
+
+    def _handle(self, item):
+        _, _, enqueued_at, future, context, fn, args, kwargs = item
+        BULKHEAD_QUEUE_DEPTH.labels(framework=self.name).set(self._queue.qsize())
+
+        # Hedge losers and abandoned waits are cancelled while still queued
+        if not future.set_running_or_notify_cancel():
+            return
+
+        request_context = context.run(get_request_context)
+        priority = request_context.priority if request_context else DEFAULT_PRIORITY
+
+        waited = time.time() - enqueued_at
+        BULKHEAD_WAIT_TIME.labels(framework=self.name, priority=priority).observe(waited)
+
+        if waited > self.queue_timeout:
+            # Caller has most likely given up; don't spend a worker on it
+            BULKHEAD_REJECTIONS.labels(framework=self.name, reason='queue_timeout').inc()
+            future.set_exception(BulkheadRejected(self.name, 'queue_timeout', self._retry_after()))
+            return
+
+        if request_context and request_context.expired():
+            # Nobody can use the answer any more; don't spend LLM calls on it
+            BULKHEAD_REJECTIONS.labels(framework=self.name, reason='deadline').inc()
+            future.set_exception(DeadlineExceeded(f"Deadline passed while queued for {self.name}"))
+            return
+
+        BULKHEAD_ACTIVE.labels(framework=self.name).inc()
+        try:
+            future.set_result(context.run(fn, *args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            BULKHEAD_ACTIVE.labels(framework=self.name).dec()
+
+    def stats(self) -> dict:
+        return {
+            'max_workers': self.max_workers,
+            'queue_depth': self._queue.qsize(),
+            'max_queue': self._queue.maxsize,
+            'batch_limit': self.batch_limit
+        }
@@ -0,0 +1,197 @@
+"""
+Circuit Breaker - Fail fast on degraded frameworks and derive timeouts from observed latency
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+from prometheus_client import Counter, Gauge
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+CIRCUIT_STATE = Gauge(
+    'docker_agent_circuit_state',
+    'Circuit breaker state (0=closed, 1=half_open, 2=open)',
+    ['framework', 'model']
+)
+
+CIRCUIT_TRANSITIONS = Counter(
+    'docker_agent_circuit_transitions_total',
+    'Circuit breaker state transitions',
+    ['framework', 'model', 'state']
+)
+
+CIRCUIT_SHORT_CIRCUITS = Counter(
+    'docker_agent_circuit_short_circuits_total',
+    'Requests failed fast by an open circuit',
+    ['framework', 'model']
+)
+
+CIRCUIT_TIMEOUT = Gauge(
+    'docker_agent_circuit_timeout_seconds',
+    'Adaptive timeout currently applied',
+    ['framework', 'model']
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused by an open circuit"""
+
+    def __init__(self, framework: str, model: str, retry_after: int):
+        super().__init__(f"Circuit open for {framework}/{model}")
+        self.framework = framework
+        self.model = model
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Rolling-window breaker for one (framework, model) pair"""
+
+    def __init__(self, framework: str, model: str):
+        self.framework = framework
+        self.model = model
+        self.window_seconds = settings.CIRCUIT_WINDOW_SECONDS
+        self.min_requests = settings.CIRCUIT_MIN_REQUESTS
+        self.error_threshold = settings.CIRCUIT_ERROR_THRESHOLD
+        self.open_seconds = settings.CIRCUIT_OPEN_SECONDS
+        self.half_open_probes = settings.CIRCUIT_HALF_OPEN_PROBES
+
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._calls = deque()  # (timestamp, ok, latency)
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(framework=framework, model=model).set(STATE_VALUES[CLOSED])
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit {self.framework}/{self.model}: {self.state} -> {state}")
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.time()
+        if state != HALF_OPEN:
+            self._probes_in_flight = 0
+        CIRCUIT_STATE.labels(framework=self.framework, model=self.model).set(STATE_VALUES[state])
+        CIRCUIT_TRANSITIONS.labels(framework=self.framework, model=self.model, state=state).inc()
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.opened_at + self.open_seconds - time.time()))
+
+    def allow(self):
+        """Admit a request or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self.open_seconds:
+                    CIRCUIT_SHORT_CIRCUITS.labels(framework=self.framework, model=self.model).inc()
+                    raise CircuitOpenError(self.framework, self.model, self._retry_after())
+                self._transition(HALF_OPEN)
+
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    CIRCUIT_SHORT_CIRCUITS.labels(framework=self.framework, model=self.model).inc()
+                    raise CircuitOpenError(self.framework, self.model, 1)
+                self._probes_in_flight += 1
+
+    def release(self):
+        """Give back an admitted request that never reached the framework"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def record(self, ok: bool, latency: float):
+        """Record the outcome of an admitted request"""
+        with self._lock:
+            now = time.time()
+
+            if self.state == HALF_OPEN:
+                if ok:
+                    # Dependency recovered; start over with a clean window
+                    self._calls.clear()
+                    self._transition(CLOSED)
+                else:
+                    self._transition(OPEN)
+
+            self._calls.append((now, ok, latency))
+            self._trim(now)
+
+            if self.state == CLOSED and len(self._calls) >= self.min_requests:
+                failures = sum(1 for _, call_ok, _ in self._calls if not call_ok)
+                if failures / len(self._calls) >= self.error_threshold:
+                    self._transition(OPEN)
+
+    def _percentile_locked(self, p: float) -> Optional[float]:
+        latencies = sorted(latency for _, ok, latency in self._calls if ok)
+        if len(latencies) < self.min_requests:
+            return None
+        index = min(len(latencies) - 1, math.ceil(p / 100 * len(latencies)) - 1)
+        return latencies[max(index, 0)]
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Latency percentile of successful calls in the window"""
+        with self._lock:
+            self._trim(time.time())
+            return self._percentile_locked(p)
+
+    def timeout(self) -> float:
+        """Timeout derived from the observed p99, clamped to configured bounds"""
+        p99 = self.percentile(99)
+        if p99 is None:
+            timeout = settings.RAG_API_READ_TIMEOUT
+        else:
+            timeout = p99 * settings.ADAPTIVE_TIMEOUT_MULTIPLIER
+        timeout = min(max(timeout, settings.ADAPTIVE_TIMEOUT_MIN), settings.ADAPTIVE_TIMEOUT_MAX)
+        CIRCUIT_TIMEOUT.labels(framework=self.framework, model=self.model).set(timeout)
+        return timeout
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._trim(time.time())
+            total = len(self._calls)
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            return {
+                'state': self.state,
+                'requests': total,
+                'error_rate': failures / total if total else 0.0,
+                'p50': self._percentile_locked(50),
+                'p90': self._percentile_locked(90),
+                'p99': self._percentile_locked(99)
+            }
+
+
+class CircuitBreakerRegistry:
+    """Breakers keyed by (framework, model)"""
+
+    def __init__(self):
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, framework: str, model: str) -> CircuitBreaker:
+        key = (framework.lower(), model)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(*key)
+            return self._breakers[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {f"{framework}/{model}": breaker.snapshot() for (framework, model), breaker in breakers}
+
+# Global circuit breaker registry
+circuit_breakers = CircuitBreakerRegistry()
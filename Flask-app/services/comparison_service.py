@@ -0,0 +1,149 @@
+"""
+Comparison Service - Runs one query against several frameworks and models concurrently
+"""
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+import structlog
+
+from config.settings import settings
+from .agent_service import agent_service
+from .database import db_manager
+
+logger = structlog.get_logger()
+
+
+class ComparisonService:
+    """Fans a query out to framework/model pairs; every run is traced under a shared comparison ID"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.COMPARE_MAX_WORKERS,
+            thread_name_prefix='compare'
+        )
+
+    def plan_runs(self, data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Expand the requested frameworks and models into (framework, model) runs"""
+        frameworks = data.get('frameworks') or []
+        models = data.get('models') or [data.get('model', 'gpt-4o-mini')]
+        if isinstance(frameworks, str):
+            frameworks = [frameworks]
+        if isinstance(models, str):
+            models = [models]
+
+        runs = list(dict.fromkeys((framework.lower(), model) for framework in frameworks for model in models))
+        if not runs:
+            raise ValueError("At least one framework is required")
+        if len(runs) > settings.COMPARE_MAX_RUNS:
+            raise ValueError(f"Too many runs ({len(runs)}), the limit is {settings.COMPARE_MAX_RUNS}")
+        return runs
+
+    def new_comparison_id(self) -> str:
+        return str(uuid.uuid4())
+
+    def run(self, data: Dict[str, Any], runs: List[Tuple[str, str]],
+            comparison_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield each run's result as it completes"""
+        timeout = float(data.get('timeout') or settings.COMPARE_RUN_TIMEOUT)
+        # Runs still queued when the caller stops waiting are dropped, not executed
+        deadline = time.time() + timeout
+
+        futures = {}
+        for framework, model in runs:
+            request_data = {
+                'framework': framework,
+                'model': model,
+                'vector_store': data.get('vector_store', 'faiss'),
+                'query': data['query'],
+                'priority': data.get('priority', 'api'),
+                'deadline': deadline,
+                'comparison_id': comparison_id,
+                # Every framework must really run; a cached or coalesced answer would report ~0s and $0
+                'no_cache': True
+            }
+            futures[self.executor.submit(agent_service.execute_query, request_data)] = (framework, model)
+
+        logger.info("Comparison started", comparison_id=comparison_id, runs=len(runs))
+
+        try:
+            # Runs start together, so one deadline bounds each of them
+            for future in as_completed(futures, timeout=timeout):
+                framework, model = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'framework': framework, 'model': model, 'status': 'error', 'error': str(e)}
+                result['comparison_id'] = comparison_id
+                yield result
+        except FutureTimeoutError:
+            for framework, model in futures.values():
+                # The run keeps going and its trace completes on its own
+                yield {
+                    'comparison_id': comparison_id,
+                    'framework': framework,
+                    'model': model,
+                    'status': 'timeout',
+                    'error': f"No result within {timeout}s"
+                }
+
+    def summarize(self, comparison_id: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Per-run latency, tokens and cost, with the fastest and cheapest successful runs"""
+        runs = {}
+        for result in results:
+            runs[f"{result.get('framework')}/{result.get('model')}"] = {
+                'status': result.get('status'),
+                'trace_id': result.get('trace_id'),
+                'duration': result.get('duration'),
+                'tokens_used': result.get('tokens_used', 0),
+                'total_cost': result.get('total_cost', 0.0)
+            }
+
+        succeeded = {key: run for key, run in runs.items() if run['status'] == 'success'}
+        return {
+            'comparison_id': comparison_id,
+            'runs': runs,
+            'succeeded': len(succeeded),
+            'failed': len(runs) - len(succeeded),
+            'fastest': min(succeeded, key=lambda key: succeeded[key]['duration']) if succeeded else None,
+            'cheapest': min(succeeded, key=lambda key: succeeded[key]['total_cost']) if succeeded else None,
+            'total_cost': sum(run['total_cost'] or 0.0 for run in runs.values())
+        }
+
+    def stream(self, data: Dict[str, Any], runs: List[Tuple[str, str]], comparison_id: str) -> Iterator[str]:
+        """Server-Sent Events: one 'run' event per result, then a 'summary' event"""
+        results = []
+        for result in self.run(data, runs, comparison_id):
+            results.append(result)
+            yield f"event: run\ndata: {json.dumps(result)}\n\n"
+
+        yield f"event: summary\ndata: {json.dumps(self.summarize(comparison_id, results))}\n\n"
+
+    def get_comparison(self, comparison_id: str) -> Optional[Dict[str, Any]]:
+        """Rebuild a comparison from its traces"""
+        traces = db_manager.get_traces_by_comparison(comparison_id)
+        if not traces:
+            return None
+
+        results = [
+            {
+                'framework': trace['framework'],
+                'model': trace['model'],
+                'trace_id': trace['trace_id'],
+                'status': trace['status'],
+                'answer': trace.get('response'),
+                'duration': trace.get('total_duration'),
+                'tokens_used': trace.get('total_tokens', 0),
+                'total_cost': trace.get('total_cost', 0.0),
+                'error': trace.get('error_message')
+            }
+            for trace in traces
+        ]
+        comparison = self.summarize(comparison_id, results)
+        comparison['results'] = results
+        return comparison
+
+# Global comparison service instance
+comparison_service = ComparisonService()
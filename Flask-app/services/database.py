@@ -6,6 +6,7 @@ from typing import Dict, Any, List, Optional
 from contextlib import contextmanager
 import json
 import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +96,16 @@ class DatabaseManager:
                 )
             """)
             
+            # On-disk tier of the response cache
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    fingerprint TEXT PRIMARY KEY,
+                    entry TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
             # Create indexes for better performance
             conn.execute("CREATE INDEX IF NOT EXISTS idx_traces_timestamp ON traces(timestamp)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_traces_status ON traces(status)")
@@ -140,6 +151,7 @@ class DatabaseManager:
                             UPDATE traces SET
                                 end_time = ?,
                                 status = ?,
+                                framework = ?,
                                 response = ?,
                                 total_duration = ?,
                                 input_tokens = ?,
@@ -155,6 +167,7 @@ class DatabaseManager:
                         """, (
                             trace_data.get('end_time'),
                             trace_data.get('status', 'started'),
+                            trace_data.get('framework', 'unknown'),
                             trace_data.get('response'),
                             trace_data.get('total_duration'),
                             trace_data.get('input_tokens', 0),
@@ -264,6 +277,48 @@ class DatabaseManager:
                 logger.error(f"Failed to save framework health: {e}")
                 return False
     
+    def get_cached_response(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Get an unexpired response cache entry"""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT entry FROM response_cache WHERE fingerprint = ? AND expires_at > ?",
+                    (fingerprint, time.time())
+                ).fetchone()
+                return json.loads(row['entry']) if row else None
+        except Exception as e:
+            logger.error(f"Failed to read response cache: {e}")
+            return None
+    
+    def save_cached_response(self, fingerprint: str, entry: Dict[str, Any], expires_at: float) -> bool:
+        """Save or replace a response cache entry"""
+        with self.lock:
+            try:
+                with self.get_connection() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO response_cache (fingerprint, entry, expires_at) VALUES (?, ?, ?)",
+                        (fingerprint, json.dumps(entry), expires_at)
+                    )
+                    # Expired rows are never read again
+                    conn.execute("DELETE FROM response_cache WHERE expires_at <= ?", (time.time(),))
+                    conn.commit()
+                    return True
+            except Exception as e:
+                logger.error(f"Failed to save response cache entry: {e}")
+                return False
+    
+    def clear_cached_responses(self) -> bool:
+        """Drop every response cache entry"""
+        with self.lock:
+            try:
+                with self.get_connection() as conn:
+                    conn.execute("DELETE FROM response_cache")
+                    conn.commit()
+                    return True
+            except Exception as e:
+                logger.error(f"Failed to clear response cache: {e}")
+                return False
+    
     def get_traces(self, limit: int = 100, status: str = None) -> List[Dict[str, Any]]:
         """Get traces with optional filtering"""
         try:
@@ -314,6 +369,29 @@ class DatabaseManager:
             logger.error(f"Failed to get trace {trace_id}: {e}")
             return None
     
+    def get_traces_by_comparison(self, comparison_id: str) -> List[Dict[str, Any]]:
+        """Get all traces recorded under a comparison ID"""
+        try:
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT * FROM traces
+                    WHERE json_extract(request_data, '$.comparison_id') = ?
+                    ORDER BY timestamp
+                """, (comparison_id,)).fetchall()
+                
+                traces = []
+                for row in rows:
+                    trace = dict(row)
+                    trace['request_data'] = json.loads(trace['request_data'] or '{}')
+                    trace['steps'] = json.loads(trace['steps'] or '[]')
+                    trace['metrics'] = json.loads(trace['metrics'] or '{}')
+                    traces.append(trace)
+                
+                return traces
+        except Exception as e:
+            logger.error(f"Failed to get traces for comparison {comparison_id}: {e}")
+            return []
+    
     def get_metrics_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get metrics summary for specified time period"""
         try:
@@ -362,6 +440,40 @@ class DatabaseManager:
             logger.error(f"Failed to get metrics summary: {e}")
             return {}
     
+    def get_framework_latency_stats(self, hours: int = 1) -> Dict[str, Dict[str, Any]]:
+        """Get per-framework latency percentiles, success rate and cost"""
+        try:
+            since = (datetime.now() - timedelta(hours=hours)).isoformat()
+            
+            with self.get_connection() as conn:
+                rows = conn.execute("""
+                    SELECT framework, latency_ms, status, total_cost
+                    FROM metrics 
+                    WHERE timestamp >= ?
+                    ORDER BY framework, latency_ms
+                """, (since,)).fetchall()
+            
+            grouped = {}
+            for row in rows:
+                grouped.setdefault(row['framework'], []).append(row)
+            
+            stats = {}
+            for framework, framework_rows in grouped.items():
+                # Rows are ordered by latency within each framework
+                latencies = [row['latency_ms'] for row in framework_rows]
+                successes = sum(1 for row in framework_rows if row['status'] in ('success', 'completed'))
+                stats[framework] = {
+                    'requests': len(framework_rows),
+                    'p50_ms': latencies[int(0.50 * (len(latencies) - 1))],
+                    'p95_ms': latencies[int(0.95 * (len(latencies) - 1))],
+                    'success_rate': successes / len(framework_rows),
+                    'avg_cost': sum(row['total_cost'] for row in framework_rows) / len(framework_rows)
+                }
+            return stats
+        except Exception as e:
+            logger.error(f"Failed to get framework latency stats: {e}")
+            return {}
+    
     def get_time_series_data(self, hours: int = 24) -> Dict[str, List]:
         """Get time series data for charts"""
         try:
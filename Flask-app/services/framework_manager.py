@@ -5,7 +5,17 @@ import importlib
 import logging
 from typing import Dict, Any, Optional
 from abc import ABC, abstractmethod
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait, FIRST_COMPLETED
+from config.settings import settings
+from core.request_context import get_request_context, use_request_context, RequestContext, DeadlineExceeded
+from .bulkhead import Bulkhead, BulkheadRejected
+from .circuit_breaker import circuit_breakers, CircuitOpenError
+from .hedging import (
+    hedge_budget, choose_hedge_partner,
+    HEDGE_ELIGIBLE, HEDGE_FIRED, HEDGE_WINS, HEDGE_SAVED_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,10 +24,13 @@ class FrameworkManager:
     
     def __init__(self):
         self.frameworks = {}
+        self.bulkheads: Dict[str, Bulkhead] = {}
+        self._bulkhead_lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
         self._initialize_frameworks()
     
     def _initialize_frameworks(self):
-        """Initialize all available frameworks"""
+        """Register all available frameworks; each one is imported on first use"""
         framework_configs = {
             'langgraph': {
                 'module': 'agents.langgraph_agent',
@@ -98,50 +111,231 @@ class FrameworkManager:
         
         for name, config in framework_configs.items():
             if config['enabled']:
-                try:
-                    self._load_framework(name, config)
-                    logger.info(f"Successfully loaded framework: {name}")
-                except Exception as e:
-                    logger.error(f"Failed to load framework {name}: {e}")
-                    # Continue loading other frameworks
+                self._load_locks[name] = threading.Lock()
+                self.frameworks[name] = {
+                    'instance': None,
+                    'class': None,
+                    'config': config,
+                    'status': 'not_loaded'
+                }
     
     def _load_framework(self, name: str, config: Dict[str, Any]):
         """Load a specific framework"""
+        import_start = time.time()
+        setup_start = None
         try:
             module = importlib.import_module(config['module'])
             agent_class = getattr(module, config['class'])
             
             # Create instance
+            setup_start = time.time()
             agent_instance = agent_class()
             
             self.frameworks[name] = {
                 'instance': agent_instance,
                 'class': agent_class,
                 'config': config,
-                'status': 'loaded'
+                'status': 'loaded',
+                'import_time': setup_start - import_start,
+                'setup_time': time.time() - setup_start
             }
+            logger.info(f"Successfully loaded framework: {name}")
         except Exception as e:
             logger.error(f"Error loading {name}: {e}")
+            now = time.time()
             self.frameworks[name] = {
                 'instance': None,
                 'class': None,
                 'config': config,
                 'status': 'failed',
-                'error': str(e)
+                'error': str(e),
+                'import_time': (setup_start or now) - import_start,
+                'setup_time': now - setup_start if setup_start else None
             }
     
+    def _ensure_loaded(self, name: str):
+        """Load a framework if it has not been loaded yet"""
+        framework = self.frameworks.get(name)
+        if not framework or framework['status'] != 'not_loaded':
+            return
+        
+        with self._load_locks[name]:
+            # Another thread may have finished loading while we waited
+            if self.frameworks[name]['status'] == 'not_loaded':
+                self._load_framework(name, self.frameworks[name]['config'])
+    
+    def warmup(self, names: Optional[list] = None, max_workers: Optional[int] = None) -> threading.Thread:
+        """Load frameworks concurrently in the background"""
+        names = names or list(self.frameworks.keys())
+        max_workers = max_workers or settings.FRAMEWORK_WARMUP_WORKERS
+        
+        def _warmup():
+            start_time = time.time()
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='framework-warmup') as pool:
+                list(pool.map(self._ensure_loaded, names))
+            logger.info(f"Framework warmup finished in {time.time() - start_time:.2f}s")
+        
+        thread = threading.Thread(target=_warmup, name='framework-warmup', daemon=True)
+        thread.start()
+        return thread
+    
     def get_framework(self, name: str) -> Optional[Any]:
         """Get framework instance by name"""
-        framework = self.frameworks.get(name.lower())
+        name = name.lower()
+        self._ensure_loaded(name)
+        framework = self.frameworks.get(name)
         if framework and framework['status'] == 'loaded':
             return framework['instance']
         return None
     
-    def execute_query(self, framework_name: str, query: str) -> Dict[str, Any]:
-        """Execute query using specified framework"""
+    def get_bulkhead(self, name: str) -> Bulkhead:
+        """Get the bounded worker pool for a framework, creating it on first use"""
+        name = name.lower()
+        with self._bulkhead_lock:
+            if name not in self.bulkheads:
+                self.bulkheads[name] = Bulkhead(
+                    name,
+                    max_workers=settings.FRAMEWORK_CONCURRENCY_OVERRIDES.get(
+                        name, settings.FRAMEWORK_MAX_CONCURRENCY
+                    ),
+                    max_queue=settings.FRAMEWORK_MAX_QUEUE,
+                    queue_timeout=settings.FRAMEWORK_QUEUE_TIMEOUT
+                )
+            return self.bulkheads[name]
+    
+    def _submit_guarded(self, name: str, framework: Any, query: str, model: str) -> Dict[str, Any]:
+        """Admit a query through the circuit breaker and queue it on the framework's bulkhead"""
+        breaker = circuit_breakers.get(name, model)
+        breaker.allow()
+        call = {
+            'name': name,
+            'breaker': breaker,
+            'timeout': breaker.timeout(),
+            'abandoned': False,
+            'finished_at': None
+        }
+        
+        def _run():
+            run_start = time.time()
+            # The adaptive timeout bounds the work itself, not only the wait for it:
+            # downstream calls (the RAG client's read timeout) follow this deadline
+            run_deadline = run_start + call['timeout']
+            parent = get_request_context()
+            adaptive = parent is None or run_deadline < parent.deadline
+            run_context = (parent or RequestContext(deadline=run_deadline)).for_framework(name, run_deadline)
+            try:
+                with use_request_context(run_context):
+                    answer = framework.run(query)
+            except DeadlineExceeded as e:
+                if not adaptive:
+                    # The caller ran out of time; says nothing about the framework
+                    raise
+                if not call['abandoned']:
+                    breaker.record(False, time.time() - run_start)
+                raise TimeoutError(f"{name} did not answer within {call['timeout']:.1f}s") from e
+            except Exception:
+                if not call['abandoned']:
+                    breaker.record(False, time.time() - run_start)
+                raise
+            finally:
+                call['finished_at'] = time.time()
+            if not call['abandoned']:
+                breaker.record(True, time.time() - run_start)
+            return answer
+        
+        try:
+            call['future'] = self.get_bulkhead(name).submit(_run)
+        except BulkheadRejected:
+            # Load shedding says nothing about the dependency's health
+            breaker.release()
+            raise
+        return call
+    
+    def _maybe_hedge(self, name: str, query: str, model: str, primary: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fire a second, equivalent framework if the primary is slower than its p90"""
+        HEDGE_ELIGIBLE.labels(framework=name).inc()
+        hedge_budget.deposit()
+        
+        delay = primary['breaker'].percentile(90)
+        if delay is None:
+            # Not enough history to know what slow looks like
+            return None
+        
+        done, _ = wait([primary['future']], timeout=delay)
+        if done:
+            return None
+        
+        partner = choose_hedge_partner(name, model)
+        if not partner or not hedge_budget.try_spend():
+            return None
+        
+        partner_framework = self.get_framework(partner)
+        if not partner_framework:
+            return None
+        
+        try:
+            call = self._submit_guarded(partner, partner_framework, query, model)
+        except (CircuitOpenError, BulkheadRejected):
+            return None
+        
+        HEDGE_FIRED.labels(framework=name).inc()
+        logger.info(f"Hedged {name} with {partner} after {delay:.2f}s")
+        return call
+    
+    def _settle(self, call: Dict[str, Any], timed_out: bool = False, blame: bool = True):
+        """Cancel a call nobody is waiting for; a loser that is already running still records its outcome"""
+        if call['future'].cancel():
+            call['breaker'].release()
+        elif timed_out:
+            call['abandoned'] = True
+            if blame:
+                call['breaker'].record(False, call['timeout'])
+            else:
+                call['breaker'].release()
+    
+    def _first_success(self, calls: list, deadline: float, blame: bool = True):
+        """Wait for the first call to succeed; raise the last error if none does
+
+        When the wait is cut short by the request deadline rather than the
+        adaptive timeout (blame=False), the framework is not charged with a failure.
+        """
+        pending = {call['future']: call for call in calls}
+        error = None
+        
+        while pending:
+            done, _ = wait(list(pending), timeout=max(0.0, deadline - time.time()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            
+            for future in done:
+                call = pending.pop(future)
+                exc = future.exception()
+                if exc is None:
+                    for loser in pending.values():
+                        self._settle(loser)
+                    return call, future.result()
+                if isinstance(exc, (BulkheadRejected, DeadlineExceeded)):
+                    call['breaker'].release()
+                error = exc
+        
+        if pending:
+            for call in pending.values():
+                self._settle(call, timed_out=True, blame=blame)
+            if not blame:
+                raise DeadlineExceeded("Deadline exceeded waiting for the framework")
+            raise TimeoutError(f"No response within {calls[0]['timeout']:.1f}s")
+        raise error
+    
+    def execute_query(self, framework_name: str, query: str, model: str = 'default',
+                      hedge: bool = False) -> Dict[str, Any]:
+        """Execute query using specified framework, optionally hedged with an equivalent one"""
         start_time = time.time()
+        request_context = get_request_context()
         
         try:
+            if request_context:
+                request_context.check(f"running {framework_name}")
+            
             framework = self.get_framework(framework_name)
             if not framework:
                 return {
@@ -151,17 +345,78 @@ class FrameworkManager:
                     'framework': framework_name
                 }
             
-            # Execute the query
-            result = framework.run(query)
+            # Execute the query on the framework's own worker pool; the adaptive
+            # timeout applies once it runs, on top of the time allowed in the queue
+            primary = self._submit_guarded(framework_name, framework, query, model)
+            adaptive_deadline = start_time + settings.FRAMEWORK_QUEUE_TIMEOUT + primary['timeout']
+            deadline = min(adaptive_deadline, request_context.deadline) if request_context else adaptive_deadline
+            
+            calls = [primary]
+            if hedge:
+                hedge_call = self._maybe_hedge(framework_name, query, model, primary)
+                if hedge_call:
+                    calls.append(hedge_call)
+            
+            winner, result = self._first_success(calls, deadline, blame=deadline == adaptive_deadline)
             duration = time.time() - start_time
             
-            return {
+            response = {
                 'answer': result,
                 'status': 'success',
                 'duration': duration,
                 'framework': framework_name
             }
             
+            if winner is not primary:
+                HEDGE_WINS.labels(framework=framework_name).inc()
+                won_at = winner['finished_at']
+                
+                def _observe_saved(future):
+                    # The primary keeps running; measure how much later it would have answered
+                    if not future.cancelled() and future.exception() is None:
+                        HEDGE_SAVED_SECONDS.labels(framework=framework_name).observe(primary['finished_at'] - won_at)
+                
+                primary['future'].add_done_callback(_observe_saved)
+                response['hedged'] = True
+                response['served_by'] = winner['name']
+            
+            return response
+            
+        except DeadlineExceeded as e:
+            logger.warning(f"Dropped query for {framework_name}: {e}")
+            
+            return {
+                'answer': f"Framework '{framework_name}' could not answer before the request deadline",
+                'status': 'timeout',
+                'duration': time.time() - start_time,
+                'framework': framework_name,
+                'error': str(e)
+            }
+            
+        except CircuitOpenError as e:
+            logger.warning(f"Circuit open for {framework_name}/{model}, failing fast")
+            
+            return {
+                'answer': f"Framework '{framework_name}' is failing for {model}, please retry in {e.retry_after}s",
+                'status': 'rejected',
+                'duration': time.time() - start_time,
+                'framework': framework_name,
+                'error': str(e),
+                'retry_after': e.retry_after
+            }
+            
+        except BulkheadRejected as e:
+            logger.warning(f"Shed query for {framework_name}: {e.reason}")
+            
+            return {
+                'answer': f"Framework '{framework_name}' is busy, please retry in {e.retry_after}s",
+                'status': 'rejected',
+                'duration': time.time() - start_time,
+                'framework': framework_name,
+                'error': str(e),
+                'retry_after': e.retry_after
+            }
+            
         except Exception as e:
             duration = time.time() - start_time
             logger.error(f"Error executing query with {framework_name}: {e}")
@@ -179,36 +434,71 @@ class FrameworkManager:
         return {
             name: {
                 'status': info['status'],
-                'error': info.get('error')
+                'error': info.get('error'),
+                'import_time': info.get('import_time'),
+                'setup_time': info.get('setup_time')
             }
             for name, info in self.frameworks.items()
         }
     
+    def probe_framework(self, name: str) -> Dict[str, Any]:
+        """Run a test query against one framework, bounded by the probe timeout"""
+        framework = self.frameworks[name]
+        
+        if framework['status'] == 'not_loaded':
+            # Not used yet; don't force an import just to probe it
+            return {'status': 'not_loaded', 'test_passed': False}
+        
+        if framework['status'] != 'loaded' or not framework['instance']:
+            return {
+                'status': 'unhealthy',
+                'test_passed': False,
+                'error': framework.get('error', 'Not loaded')
+            }
+        
+        start_time = time.time()
+        try:
+            # Try a simple test query at batch priority so probes never delay user traffic
+            probe_context = RequestContext('batch', deadline=start_time + settings.HEALTH_PROBE_TIMEOUT)
+            with use_request_context(probe_context):
+                future = self.get_bulkhead(name).submit(framework['instance'].run, "docker version")
+            future.result(timeout=settings.HEALTH_PROBE_TIMEOUT)
+            return {
+                'status': 'healthy',
+                'test_passed': True,
+                'latency': time.time() - start_time
+            }
+        except FutureTimeoutError:
+            return {
+                'status': 'unhealthy',
+                'test_passed': False,
+                'error': f"Probe timed out after {settings.HEALTH_PROBE_TIMEOUT}s",
+                'latency': time.time() - start_time
+            }
+        except (BulkheadRejected, DeadlineExceeded) as e:
+            return {
+                'status': 'degraded',
+                'test_passed': False,
+                'error': str(e)
+            }
+        except Exception as e:
+            return {
+                'status': 'unhealthy',
+                'test_passed': False,
+                'error': str(e),
+                'latency': time.time() - start_time
+            }
+    
     def health_check(self) -> Dict[str, Any]:
-        """Check health of all frameworks"""
-        health_status = {}
+        """Probe all frameworks concurrently"""
+        names = list(self.frameworks.keys())
         
-        for name, framework in self.frameworks.items():
-            try:
-                if framework['status'] == 'loaded' and framework['instance']:
-                    # Try a simple test query
-                    test_result = framework['instance'].run("docker version")
-                    health_status[name] = {
-                        'status': 'healthy',
-                        'test_passed': True
-                    }
-                else:
-                    health_status[name] = {
-                        'status': 'unhealthy',
-                        'test_passed': False,
-                        'error': framework.get('error', 'Not loaded')
-                    }
-            except Exception as e:
-                health_status[name] = {
-                    'status': 'unhealthy',
-                    'test_passed': False,
-                    'error': str(e)
-                }
+        with ThreadPoolExecutor(max_workers=settings.HEALTH_PROBE_WORKERS, thread_name_prefix='health-probe') as pool:
+            health_status = dict(zip(names, pool.map(self.probe_framework, names)))
+        
+        for name, status in health_status.items():
+            status['import_time'] = self.frameworks[name].get('import_time')
+            status['setup_time'] = self.frameworks[name].get('setup_time')
         
         return health_status
 
@@ -0,0 +1,90 @@
+"""
+Health Scheduler - Probes frameworks in the background and serves cached results
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+import structlog
+
+from config.settings import settings
+from .database import db_manager
+from .framework_manager import framework_manager, FrameworkManager
+
+logger = structlog.get_logger()
+
+
+class HealthScheduler:
+    """Periodically refreshes framework health so endpoints never probe inline"""
+
+    def __init__(self, manager: FrameworkManager,
+                 interval: Optional[float] = None,
+                 ttl: Optional[float] = None):
+        self.manager = manager
+        self.interval = interval or settings.HEALTH_CHECK_INTERVAL
+        self.ttl = ttl or settings.HEALTH_CHECK_TTL
+        self._snapshot: Dict[str, Any] = {}
+        self._checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the background probe loop"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._loop, name='health-scheduler', daemon=True)
+        self._thread.start()
+        logger.info("Health scheduler started", interval=self.interval)
+
+    def _loop(self):
+        while True:
+            self.refresh()
+            time.sleep(self.interval)
+
+    def refresh(self) -> Dict[str, Any]:
+        """Probe all frameworks now, cache and persist the result"""
+        if not self._refresh_lock.acquire(blocking=False):
+            # A refresh is already running; serve what we have
+            return self._snapshot
+
+        try:
+            health = self.manager.health_check()
+            checked_at = datetime.utcnow().isoformat()
+            for status in health.values():
+                status['checked_at'] = checked_at
+
+            self._snapshot = health
+            self._checked_at = time.time()
+            db_manager.save_framework_health(health)
+            return health
+        except Exception as e:
+            logger.error("Framework health refresh failed", error=str(e))
+            return self._snapshot
+        finally:
+            self._refresh_lock.release()
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Get the cached health snapshot without probing"""
+        age = time.time() - self._checked_at
+
+        if (not self._snapshot or age > self.ttl) and not self._refresh_lock.locked():
+            # Nothing fresh cached (scheduler disabled or stalled); refresh off the request path
+            threading.Thread(target=self.refresh, name='health-refresh', daemon=True).start()
+
+        if not self._snapshot:
+            return {
+                name: {
+                    'status': 'unknown' if info['status'] == 'loaded' else info['status'],
+                    'test_passed': False,
+                    'error': info.get('error'),
+                    'import_time': info.get('import_time'),
+                    'setup_time': info.get('setup_time')
+                }
+                for name, info in self.manager.get_available_frameworks().items()
+            }
+
+        return self._snapshot
+
+# Global health scheduler instance
+health_scheduler = HealthScheduler(framework_manager)
@@ -0,0 +1,81 @@
+"""
+Hedging - Budget and bookkeeping for hedged framework requests
+"""
+import threading
+from typing import List, Optional
+
+from prometheus_client import Counter, Histogram
+
+from config.settings import settings
+from .circuit_breaker import circuit_breakers, OPEN
+
+HEDGE_ELIGIBLE = Counter(
+    'docker_agent_hedge_eligible_total',
+    'Hedging-enabled requests',
+    ['framework']
+)
+
+HEDGE_FIRED = Counter(
+    'docker_agent_hedge_fired_total',
+    'Hedge requests sent to a second framework',
+    ['framework']
+)
+
+HEDGE_WINS = Counter(
+    'docker_agent_hedge_wins_total',
+    'Hedge requests that answered before the primary',
+    ['framework']
+)
+
+HEDGE_SAVED_SECONDS = Histogram(
+    'docker_agent_hedge_saved_seconds',
+    'Latency saved when a hedge beat the primary',
+    ['framework']
+)
+
+
+class HedgeBudget:
+    """Token bucket that caps hedges at a fraction of eligible requests"""
+
+    def __init__(self, ratio: Optional[float] = None, burst: Optional[float] = None):
+        self.ratio = settings.HEDGE_BUDGET_RATIO if ratio is None else ratio
+        self.burst = burst or settings.HEDGE_BUDGET_BURST
+        self._tokens = self.burst
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Credit the budget for one hedging-enabled request"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one hedge from the budget if there is one"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+def equivalent_frameworks(name: str) -> List[str]:
+    """Frameworks that give the same answer as `name`, from the configured hedge groups"""
+    for group in settings.HEDGE_GROUPS:
+        if name in group:
+            return [other for other in group if other != name]
+    return []
+
+
+def choose_hedge_partner(name: str, model: str) -> Optional[str]:
+    """Pick the equivalent framework with the fastest observed p90 and a closed circuit"""
+    best, best_p90 = None, None
+    for other in equivalent_frameworks(name):
+        breaker = circuit_breakers.get(other, model)
+        if breaker.state == OPEN:
+            continue
+        p90 = breaker.percentile(90)
+        if best is None or (p90 is not None and (best_p90 is None or p90 < best_p90)):
+            best, best_p90 = other, p90
+    return best
+
+# Global hedge budget instance
+hedge_budget = HedgeBudget()
@@ -0,0 +1,171 @@
+"""
+Job Service - Runs agent queries in the background and exposes their state
+"""
+import ipaddress
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Iterator
+from urllib.parse import urlparse
+
+import requests
+import structlog
+
+from config.settings import settings
+from core.tracing import tracing_manager
+from core.request_context import RequestContext
+from .agent_service import agent_service
+
+logger = structlog.get_logger()
+
+# Trace statuses that mean the job has not finished yet
+PENDING_STATUSES = ('queued', 'started', 'running')
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue cannot accept more work"""
+    pass
+
+
+class InvalidCallbackURL(ValueError):
+    """Raised when a job's callback_url may not be called"""
+    pass
+
+
+def validate_callback_url(callback_url: str):
+    """Allow only http(s) callbacks to allowlisted hosts or hosts with public addresses"""
+    parsed = urlparse(callback_url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise InvalidCallbackURL("callback_url must be an http(s) URL")
+
+    host = parsed.hostname.lower()
+    if host in (allowed.lower() for allowed in settings.JOB_CALLBACK_ALLOWED_HOSTS):
+        return
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, parsed.port or None)}
+    except (socket.gaierror, UnicodeError, ValueError):
+        raise InvalidCallbackURL(f"callback_url host '{host}' does not resolve")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if not ip.is_global or ip.is_multicast:
+            raise InvalidCallbackURL(f"callback_url host '{host}' resolves to a non-public address")
+
+
+class JobService:
+    """Bounded background executor for agent queries; job state lives in the traces table"""
+
+    def __init__(self, max_workers: Optional[int] = None, queue_size: Optional[int] = None):
+        max_workers = max_workers or settings.JOB_MAX_WORKERS
+        queue_size = settings.JOB_QUEUE_SIZE if queue_size is None else queue_size
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='agent-job')
+        # Running plus waiting jobs; ThreadPoolExecutor's own queue is unbounded
+        self.slots = threading.BoundedSemaphore(max_workers + queue_size)
+
+    def submit(self, request_data: Dict[str, Any]) -> str:
+        """Queue a query and return its trace ID immediately"""
+        if request_data.get('callback_url'):
+            validate_callback_url(request_data['callback_url'])
+        
+        if not self.slots.acquire(blocking=False):
+            raise JobQueueFull("Job queue is full")
+        
+        # The deadline runs from submission, so time spent queued counts against it
+        request_data.setdefault('deadline', RequestContext.from_request(request_data).deadline)
+
+        try:
+            trace_id = tracing_manager.start_trace(request_data, status='queued')
+            self.executor.submit(self._run, trace_id, request_data)
+        except Exception:
+            self.slots.release()
+            raise
+
+        logger.info("Job queued", trace_id=trace_id, framework=request_data.get('framework'))
+        return trace_id
+
+    def _run(self, trace_id: str, request_data: Dict[str, Any]):
+        """Execute a queued job and fire its callback"""
+        try:
+            result = agent_service.execute_query(request_data, trace_id=trace_id)
+        except Exception as e:
+            logger.error("Job failed", trace_id=trace_id, error=str(e))
+            tracing_manager.end_trace(trace_id, 'failed', '', str(e))
+            result = {'trace_id': trace_id, 'status': 'error', 'error': str(e)}
+        finally:
+            self.slots.release()
+
+        callback_url = request_data.get('callback_url')
+        if callback_url:
+            self._send_callback(callback_url, result)
+
+    def _send_callback(self, callback_url: str, result: Dict[str, Any]):
+        """POST the finished job to the caller's webhook"""
+        try:
+            # Checked again at delivery in case the host now resolves elsewhere
+            validate_callback_url(callback_url)
+            response = requests.post(
+                callback_url,
+                json=result,
+                timeout=settings.JOB_CALLBACK_TIMEOUT,
+                allow_redirects=False
+            )
+            response.raise_for_status()
+            logger.info("Job callback delivered", trace_id=result.get('trace_id'), url=callback_url)
+        except Exception as e:
+            logger.error("Job callback failed", trace_id=result.get('trace_id'), url=callback_url, error=str(e))
+
+    def get_job(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Get job state from its trace"""
+        trace = tracing_manager.get_trace(trace_id)
+        if not trace:
+            return None
+
+        done = trace['status'] not in PENDING_STATUSES
+        job = {
+            'trace_id': trace_id,
+            'status': trace['status'],
+            'done': done,
+            'framework': trace['framework'],
+            'model': trace['model'],
+            'vector_store': trace['vector_store'],
+            'submitted_at': trace['timestamp'],
+            'finished_at': trace.get('end_time')
+        }
+
+        if done:
+            job.update({
+                'answer': trace.get('response'),
+                'duration': trace.get('total_duration'),
+                'input_tokens': trace.get('input_tokens', 0),
+                'output_tokens': trace.get('output_tokens', 0),
+                'tokens_used': trace.get('total_tokens', 0),
+                'total_cost': trace.get('total_cost', 0.0),
+                'error': trace.get('error_message')
+            })
+
+        return job
+
+    def stream_events(self, trace_id: str) -> Iterator[str]:
+        """Yield Server-Sent Events on each status change until the job finishes"""
+        last_status = None
+        while True:
+            job = self.get_job(trace_id)
+            if job is None:
+                yield f"event: error\ndata: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+
+            if job['status'] != last_status:
+                last_status = job['status']
+                event = 'result' if job['done'] else 'status'
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+
+            if job['done']:
+                return
+
+            time.sleep(settings.JOB_EVENTS_POLL_INTERVAL)
+
+# Global job service instance
+job_service = JobService()
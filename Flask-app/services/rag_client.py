@@ -0,0 +1,181 @@
+"""
+RAG API Client - Shared, pooled HTTP client for all calls to the RAG API
+"""
+import logging
+import random
+import time
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from prometheus_client import Counter, Histogram
+
+from config.settings import settings
+from core.request_context import get_request_context, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+RAG_API_LATENCY = Histogram(
+    'docker_agent_rag_api_request_duration_seconds',
+    'RAG API call latency in seconds',
+    ['source', 'status']
+)
+
+RAG_API_RETRIES = Counter(
+    'docker_agent_rag_api_retries_total',
+    'RAG API calls retried',
+    ['source', 'reason']
+)
+
+# Gateway-style failures where the RAG API did not run the request
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+def _never_sent(error: requests.ConnectionError) -> bool:
+    """True if the connection failed before the request went out, so retrying can't run it twice"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    cause = error.args[0] if error.args else None
+    return isinstance(getattr(cause, 'reason', cause), NewConnectionError)
+
+
+class RAGAPIError(Exception):
+    """Raised when the RAG API cannot produce an answer"""
+    pass
+
+
+class RAGAPIDeadlineExceeded(RAGAPIError, DeadlineExceeded):
+    """Raised when the request deadline leaves no time to call the RAG API"""
+    pass
+
+
+class RAGAPIClient:
+    """Keep-alive client for the RAG API with pooling, timeouts and retries"""
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 backoff_base: Optional[float] = None,
+                 pool_size: Optional[int] = None):
+        self.base_url = (base_url or settings.RAG_API_URL).rstrip('/')
+        self.connect_timeout = connect_timeout or settings.RAG_API_CONNECT_TIMEOUT
+        self.read_timeout = read_timeout or settings.RAG_API_READ_TIMEOUT
+        self.max_retries = settings.RAG_API_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = backoff_base or settings.RAG_API_BACKOFF_BASE
+
+        pool_size = pool_size or settings.RAG_API_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    def _retry_delay(self, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None if retries or the deadline are used up"""
+        if attempt >= self.max_retries:
+            return None
+        delay = self._backoff(attempt)
+        request_context = get_request_context()
+        if request_context and request_context.remaining() <= delay:
+            return None
+        return delay
+
+    def post(self, path: str, payload: Dict[str, Any], source: str = 'unknown') -> Dict[str, Any]:
+        """POST to the RAG API and return the decoded JSON body"""
+        url = f"{self.base_url}{path}"
+        request_context = get_request_context()
+        attempt = 0
+
+        while True:
+            read_timeout = self.read_timeout
+            headers = {}
+            if request_context:
+                remaining = request_context.remaining()
+                if remaining <= 0:
+                    raise RAGAPIDeadlineExceeded("Request deadline passed before calling the RAG API")
+                # Never wait longer than the caller is willing to
+                read_timeout = min(read_timeout, remaining)
+                headers = {
+                    'X-Request-Deadline': f"{request_context.deadline:.3f}",
+                    'X-Request-Priority': request_context.priority
+                }
+
+            start_time = time.time()
+            try:
+                response = self.session.post(
+                    url,
+                    json=payload,
+                    headers=headers,
+                    timeout=(self.connect_timeout, read_timeout)
+                )
+            except requests.ConnectionError as e:
+                RAG_API_LATENCY.labels(source=source, status='connection_error').observe(time.time() - start_time)
+                if not _never_sent(e):
+                    # Reset or aborted after the request was sent; /ask may have run commands already
+                    raise RAGAPIError(f"RAG API connection failed: {e}") from e
+                delay = self._retry_delay(attempt)
+                if delay is not None:
+                    RAG_API_RETRIES.labels(source=source, reason='connection_error').inc()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                raise RAGAPIError(f"RAG API unreachable: {e}") from e
+            except requests.Timeout as e:
+                RAG_API_LATENCY.labels(source=source, status='timeout').observe(time.time() - start_time)
+                if read_timeout < self.read_timeout:
+                    raise RAGAPIDeadlineExceeded("RAG API did not answer before the request deadline") from e
+                raise RAGAPIError(f"RAG API timed out after {read_timeout}s") from e
+
+            RAG_API_LATENCY.labels(source=source, status=str(response.status_code)).observe(time.time() - start_time)
+
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                delay = self._retry_delay(attempt)
+                if delay is not None:
+                    RAG_API_RETRIES.labels(source=source, reason=str(response.status_code)).inc()
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as e:
+                raise RAGAPIError(str(e)) from e
+
+            return response.json()
+
+    def ask(self, query: str,
+            framework: str = 'langgraph',
+            llm_model: str = 'gpt-4o-mini',
+            vector_store: str = 'faiss',
+            source: Optional[str] = None) -> Dict[str, Any]:
+        """Call the RAG API /ask endpoint"""
+        payload = {
+            "framework": framework,
+            "llm_model": llm_model,
+            "vector_store": vector_store,
+            "query": query
+        }
+        result = self.post('/ask', payload, source=source or framework)
+
+        truncated_outputs = result.get('truncated_outputs')
+        request_context = get_request_context()
+        if truncated_outputs and request_context:
+            request_context.annotate('truncated_outputs', truncated_outputs)
+        usage = result.get('usage')
+        if usage and request_context:
+            # One record per call, tagged with the Flask framework that made it (not the
+            # RAG backend, which most agents share); a hedged request gets one per framework run
+            request_context.annotate('llm_usage', [{
+                'source': request_context.framework or source or framework,
+                'usage': usage
+            }])
+        return result
+
+# Global RAG API client instance
+rag_api_client = RAGAPIClient()
@@ -0,0 +1,175 @@
+"""
+Response Cache - Exact-match cache of agent answers keyed by a normalized request fingerprint
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from config.settings import settings
+from .database import db_manager
+
+logger = structlog.get_logger()
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    'docker_agent_response_cache_requests_total',
+    'Response cache lookups',
+    ['result']
+)
+
+# Optional object group ("docker container rm") before the subcommand
+_MUTATING_COMMAND = re.compile(
+    r'\bdocker(?:-compose)?\s+(?:(?:container|image|volume|network|system|builder)\s+)?(?:'
+    + '|'.join(map(re.escape, settings.RESPONSE_CACHE_BYPASS_COMMANDS))
+    + r')\b',
+    re.IGNORECASE
+)
+
+# Plain-language requests such as "stop all running containers"
+_MUTATING_INTENT = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, settings.RESPONSE_CACHE_MUTATING_VERBS)) + r')\b',
+    re.IGNORECASE
+)
+
+_READ_ONLY_INTENT = re.compile(
+    r'^\s*(?:please\s+)?(?:' + '|'.join(map(re.escape, settings.RESPONSE_CACHE_READ_ONLY_PREFIXES)) + r')\b',
+    re.IGNORECASE
+)
+
+
+# Questions whose answer is the current state of containers rather than documentation
+_LIVE_STATE = re.compile(
+    r'\bdocker(?:-compose)?\s+(?:(?:container|image|system)\s+)?(?:ps|ls|list|logs|stats|top|inspect|info|events|images|df)\b'
+    r'|\b(?:running|logs?|status|stats|health|healthy|uptime|currently|right now|exited|stopped)\b',
+    re.IGNORECASE
+)
+
+
+def fingerprint(framework: str, model: str, vector_store: str, query: str) -> str:
+    """Stable key for a request; whitespace and case of the config fields don't matter"""
+    normalized = {
+        'framework': framework.strip().lower(),
+        'model': model.strip(),
+        'vector_store': vector_store.strip().lower(),
+        'query': ' '.join(query.split())
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def is_mutating(query: str) -> bool:
+    """True if the query may make the agent change Docker state"""
+    return bool(_MUTATING_COMMAND.search(query) or _MUTATING_INTENT.search(query))
+
+
+def cache_ttl(query: str) -> float:
+    """Seconds an answer to `query` may be replayed"""
+    if _LIVE_STATE.search(query):
+        return settings.RESPONSE_CACHE_LIVE_STATE_TTL
+    return settings.RESPONSE_CACHE_TTL
+
+
+def is_cacheable(request_data: Dict[str, Any]) -> bool:
+    """Cache only read-only questions; anything that may make the agent change state runs every time
+
+    A replayed answer to "remove the nginx container" would claim success
+    without running anything, so when in doubt the query is not cached.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or request_data.get('no_cache'):
+        return False
+    query = request_data.get('query', '')
+    if is_mutating(query):
+        return False
+    return bool(_READ_ONLY_INTENT.search(query))
+
+
+class ResponseCache:
+    """In-memory LRU with TTL, backed by an optional SQLite tier"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 disk_enabled: Optional[bool] = None):
+        self.max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.RESPONSE_CACHE_TTL
+        self.disk_enabled = settings.RESPONSE_CACHE_DISK_ENABLED if disk_enabled is None else disk_enabled
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        # Bumped on invalidation so answers computed before a mutation aren't stored after it
+        self.generation = 0
+
+    def get(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Look up an entry; returns (entry, tier) or (None, None)"""
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached:
+                expires_at, entry = cached
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    RESPONSE_CACHE_REQUESTS.labels(result='memory_hit').inc()
+                    return entry, 'memory'
+                del self._entries[key]
+
+        if self.disk_enabled:
+            entry = db_manager.get_cached_response(key)
+            if entry:
+                # Promote so the next lookup stays in memory
+                self._put_memory(key, entry, entry['expires_at'])
+                RESPONSE_CACHE_REQUESTS.labels(result='disk_hit').inc()
+                return entry, 'disk'
+
+        RESPONSE_CACHE_REQUESTS.labels(result='miss').inc()
+        return None, None
+
+    def _put_memory(self, key: str, entry: Dict[str, Any], expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def set(self, key: str, entry: Dict[str, Any], generation: int, ttl: Optional[float] = None):
+        """Store an entry in every enabled tier, unless the cache was invalidated since `generation`"""
+        expires_at = time.time() + (ttl or self.ttl)
+        entry = dict(entry, cached_at=time.time(), expires_at=expires_at)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (expires_at, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self.disk_enabled:
+            db_manager.save_cached_response(key, entry, expires_at)
+
+    def invalidate(self):
+        """Drop every entry; called around any request that may change Docker state"""
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            self.generation += 1
+        if self.disk_enabled:
+            db_manager.clear_cached_responses()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'live_state_ttl': settings.RESPONSE_CACHE_LIVE_STATE_TTL,
+                'invalidations': self.invalidations,
+                'disk_enabled': self.disk_enabled
+            }
+
+# Global response cache instance
+response_cache = ResponseCache()
@@ -0,0 +1,132 @@
+"""
+Framework Router - Picks a backend for "auto" requests from live latency, success rate and cost
+"""
+import random
+import threading
+from typing import Dict, Any, List, Optional
+
+import structlog
+
+from config.settings import settings
+from .circuit_breaker import circuit_breakers, OPEN
+from .database import db_manager
+from .framework_manager import framework_manager, FrameworkManager
+from .health_scheduler import health_scheduler
+
+logger = structlog.get_logger()
+
+AUTO_FRAMEWORK = 'auto'
+
+# Health states that rule a framework out of routing
+UNROUTABLE_STATUSES = ('unhealthy', 'failed')
+
+
+class FrameworkRouter:
+    """EWMA scoring with epsilon-greedy exploration over healthy frameworks"""
+
+    def __init__(self, manager: FrameworkManager):
+        self.manager = manager
+        self.alpha = settings.ROUTER_EWMA_ALPHA
+        self.exploration_rate = settings.ROUTER_EXPLORATION_RATE
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._seeded = False
+        self._lock = threading.Lock()
+
+    def _seed(self):
+        """Start from recent per-framework stats in the metrics store"""
+        stats = db_manager.get_framework_latency_stats(hours=settings.ROUTER_STATS_WINDOW_HOURS)
+        with self._lock:
+            if self._seeded:
+                return
+            for name, row in stats.items():
+                if name not in self.manager.frameworks:
+                    continue
+                self._stats[name] = {
+                    'latency': row['p50_ms'] / 1000,
+                    'p95': row['p95_ms'] / 1000,
+                    'success': row['success_rate'],
+                    'cost': row['avg_cost'],
+                    'samples': row['requests']
+                }
+            self._seeded = True
+        logger.info("Framework router seeded", frameworks=len(stats))
+
+    def _candidates(self, model: str) -> List[str]:
+        names = settings.ROUTER_CANDIDATES or list(self.manager.frameworks.keys())
+        health = health_scheduler.get_snapshot()
+
+        candidates = []
+        for name in names:
+            if health.get(name, {}).get('status') in UNROUTABLE_STATUSES:
+                continue
+            if circuit_breakers.get(name, model).state == OPEN:
+                continue
+            candidates.append(name)
+        return candidates
+
+    def _score(self, name: str, model: str) -> float:
+        """Expected cost of sending a request to a framework, in seconds; lower is better"""
+        stats = self._stats.get(name)
+        if not stats:
+            return settings.ROUTER_PRIOR_LATENCY
+
+        p95 = circuit_breakers.get(name, model).percentile(95) or stats['p95']
+        latency = stats['latency'] + settings.ROUTER_TAIL_WEIGHT * max(0.0, p95 - stats['latency'])
+        return (latency + settings.ROUTER_COST_WEIGHT * stats['cost']) / max(stats['success'], 0.01)
+
+    def choose(self, model: str) -> Optional[Dict[str, Any]]:
+        """Pick a framework, or None if nothing is routable"""
+        if not self._seeded:
+            self._seed()
+
+        candidates = self._candidates(model)
+        if not candidates:
+            return None
+
+        with self._lock:
+            scores = {name: round(self._score(name, model), 4) for name in candidates}
+
+        if len(candidates) > 1 and random.random() < self.exploration_rate:
+            framework = random.choice(candidates)
+            reason = 'explore'
+        else:
+            framework = min(scores, key=scores.get)
+            reason = 'exploit'
+
+        return {
+            'framework': framework,
+            'reason': reason,
+            'score': scores[framework],
+            'scores': scores,
+            'candidates': len(candidates)
+        }
+
+    def record(self, name: str, latency: float, success: bool, cost: float):
+        """Fold one finished request into the framework's moving averages"""
+        with self._lock:
+            stats = self._stats.get(name)
+            if not stats:
+                self._stats[name] = {
+                    'latency': latency,
+                    'p95': latency,
+                    'success': 1.0 if success else 0.0,
+                    'cost': cost,
+                    'samples': 1
+                }
+                return
+
+            a = self.alpha
+            if success:
+                # Failures are often fast; keep them out of the latency estimate
+                stats['latency'] = a * latency + (1 - a) * stats['latency']
+                stats['p95'] = max(latency, (1 - a) * stats['p95'] + a * latency)
+                stats['cost'] = a * cost + (1 - a) * stats['cost']
+            stats['success'] = a * (1.0 if success else 0.0) + (1 - a) * stats['success']
+            stats['samples'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+# Global framework router instance
+framework_router = FrameworkRouter(framework_manager)
@@ -0,0 +1,63 @@
+"""
+Single Flight - Coalesces concurrent identical requests onto one execution
+"""
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from prometheus_client import Counter
+
+COALESCED_REQUESTS = Counter(
+    'docker_agent_coalesced_requests_total',
+    'Requests that attached to an identical in-flight request instead of executing',
+    ['framework']
+)
+
+
+class Flight:
+    """One in-flight execution that followers can wait on"""
+
+    def __init__(self, leader_trace_id: str):
+        self.leader_trace_id = leader_trace_id
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._done = threading.Event()
+
+    def finish(self, result: Optional[Dict[str, Any]], error: Optional[str]):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: float) -> bool:
+        return self._done.wait(timeout)
+
+
+class SingleFlight:
+    """Registry of in-flight executions keyed by request fingerprint"""
+
+    def __init__(self):
+        self._flights: Dict[str, Flight] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: str, trace_id: str) -> Tuple[Flight, bool]:
+        """Attach to the flight for `key`; returns (flight, True) if the caller must execute it"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight:
+                return flight, False
+            flight = self._flights[key] = Flight(trace_id)
+            return flight, True
+
+    def complete(self, key: str, flight: Flight,
+                 result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Publish the leader's outcome and release the followers"""
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        flight.finish(result, error)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+# Global single-flight registry
+single_flight = SingleFlight()
@@ -1,6 +1,6 @@
 import re
 import tiktoken
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -82,13 +82,48 @@ class TokenCalculator:
             logger.debug(f"Could not extract tokens from response: {e}")
             return None, None
     
+    def extract_provider_usage(self, usages: List[Dict[str, Any]]) -> Tuple[Optional[int], Optional[int]]:
+        """Sum provider-reported usage records; (None, None) if none carried token counts
+
+        Accepts the shapes providers report in: OpenAI/LiteLLM (prompt_tokens,
+        completion_tokens), LangChain usage_metadata and the RAG API (input_tokens,
+        output_tokens), Bedrock bodies (inputTokens, outputTokens) and Bedrock
+        response headers (x-amzn-bedrock-input-token-count, ...).
+        """
+        input_tokens = output_tokens = None
+        for usage in usages or []:
+            record_input, record_output = self._usage_counts(usage)
+            if record_input is not None:
+                input_tokens = (input_tokens or 0) + record_input
+            if record_output is not None:
+                output_tokens = (output_tokens or 0) + record_output
+        return input_tokens, output_tokens
+    
+    def _usage_counts(self, usage: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+        headers = {str(key).lower(): value for key, value in (usage or {}).items()}
+        input_keys = ('input_tokens', 'prompt_tokens', 'inputtokens', 'x-amzn-bedrock-input-token-count')
+        output_keys = ('output_tokens', 'completion_tokens', 'outputtokens', 'x-amzn-bedrock-output-token-count')
+        try:
+            input_tokens = next((int(headers[key]) for key in input_keys if headers.get(key) is not None), None)
+            output_tokens = next((int(headers[key]) for key in output_keys if headers.get(key) is not None), None)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring malformed usage record: {usage}")
+            return None, None
+        return input_tokens, output_tokens
+    
     def calculate_tokens_and_cost(self, 
                                   query: str, 
                                   response: str, 
                                   model: str,
                                   actual_input_tokens: Optional[int] = None,
-                                  actual_output_tokens: Optional[int] = None) -> Dict[str, any]:
-        """Calculate tokens and costs with fallback to estimation"""
+                                  actual_output_tokens: Optional[int] = None,
+                                  actual_source: str = 'provider') -> Dict[str, any]:
+        """Calculate tokens and costs with fallback to estimation
+
+        token_source in the result is `actual_source` ('provider' for usage the
+        LLM provider reported, 'response' for counts found in the answer text)
+        when both counts were given, and 'estimated' otherwise.
+        """
         
         # Use actual tokens if provided, otherwise estimate
         if actual_input_tokens is not None:
@@ -102,6 +137,9 @@ class TokenCalculator:
             output_tokens = self.count_tokens(response, model)
         
         total_tokens = input_tokens + output_tokens
+        token_source = 'estimated'
+        if actual_input_tokens is not None and actual_output_tokens is not None:
+            token_source = actual_source
         
         # Calculate costs
         pricing = self.token_costs.get(model, self.token_costs['gpt-4o-mini'])
@@ -117,7 +155,8 @@ class TokenCalculator:
             'output_cost': round(output_cost, 6),
             'total_cost': round(total_cost, 6),
             'model': model,
-            'pricing': pricing
+            'pricing': pricing,
+            'token_source': token_source
         }
     
     def get_model_pricing(self, model: str) -> Dict[str, float]:
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from app.routers.ask import router as ask_router
+from app.routers.index import router as index_router
 import logging
 from app.services.vector_store import get_vector_store
 from app.services.llm import get_llm
 from app.services.rag_chain import build_rag_retrieval_chain
+from app.tools.docker_executor import docker_executor
 import dspy
 import os 
 
@@ -15,6 +17,7 @@ app = FastAPI(
 
 # Mount the /ask router
 app.include_router(ask_router, prefix="", tags=["RAG"])
+app.include_router(index_router, prefix="", tags=["Index"])
 
 
 
@@ -51,4 +54,9 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/tools/command-cache")
+def command_cache_stats():
+    """Hit/miss counters of the shared Docker command result cache"""
+    return docker_executor.cache.stats()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Literal
+from typing import Any, Dict, List, Literal
 
 FrameworkChoices = Literal["langgraph", "autogen","llamaindex","dspy"]         # extend when needed
 LLMChoices       = Literal['gpt-4o','gpt-4o-mini', "gpt-4.1", "gpt-4.1-mini", "gpt-3.5-turbo", 'llama3-8b-8192','gemma2-9b-it',"llama-3.3-70b-versatile","gemini-2.0-flash"]    # extend when needed
@@ -14,3 +14,5 @@ class RAGRequest(BaseModel):
 
 class RAGResponse(BaseModel):
     answer: str
+    truncated_outputs: List[Dict[str, Any]] = []   # tool output trimmed by the command runner
+    usage: Dict[str, Any] = {}                     # provider-reported tokens, see services/usage.py
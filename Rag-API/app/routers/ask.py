@@ -1,16 +1,35 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header
+from typing import Optional
 from app.models import RAGRequest, RAGResponse
 from app.services.vector_store import get_vector_store
 from app.services.llm import get_llm, get_llama_index_llm
 from app.services.rag_chain import build_rag_retrieval_chain
 from app.services.frameworks import get_agent
+from app.services.usage import track_usage, record_usage
+from app.tools.command_runner import track_truncations
+import dspy
 import logging
 import asyncio
+import time
 
 router = APIRouter()
 
 @router.post("/ask", response_model=RAGResponse)
-def ask(request: RAGRequest):
+def ask(request: RAGRequest, x_request_deadline: Optional[float] = Header(default=None)):
+    # Absolute deadline (epoch seconds) from the caller; don't spend LLM calls on expired work
+    if x_request_deadline is not None and time.time() >= x_request_deadline:
+        raise HTTPException(status_code=504, detail="Request deadline exceeded")
+
+    # Tool output cut down on its way to the LLM is reported back to the caller,
+    # and so is the token usage the providers reported for every LLM call
+    with track_truncations() as truncated_outputs, track_usage() as usage:
+        response = _ask(request)
+    response.truncated_outputs = truncated_outputs
+    response.usage = usage.to_dict()
+    return response
+
+
+def _ask(request: RAGRequest) -> RAGResponse:
     try:
         # Initialize component
         vector_store = get_vector_store(request.vector_store)
@@ -44,7 +63,12 @@ def ask(request: RAGRequest):
             rag_chain = build_rag_retrieval_chain(llm, vector_store)
             agent = get_agent("dspy", llm, rag_chain)
 
-            pred = agent(question=request.query)
+            # DSPy calls its own configured LM through litellm, not the callback-wrapped model
+            with dspy.context(track_usage=True):
+                pred = agent(question=request.query)
+            get_lm_usage = getattr(pred, "get_lm_usage", None)
+            for model, lm_usage in ((get_lm_usage() if get_lm_usage else None) or {}).items():
+                record_usage(model, lm_usage.get("prompt_tokens") or 0, lm_usage.get("completion_tokens") or 0)
             return RAGResponse(answer=str(pred.answer))
 
         else:
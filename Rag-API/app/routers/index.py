@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException
+from app.services.vector_store import rebuild_vector_store, get_index_status
+
+router = APIRouter()
+
+
+@router.post("/index/{store_name}/rebuild", status_code=202)
+def rebuild_index(store_name: str):
+    """
+    Rebuilds the index in the background and hot-swaps it once validated.
+    """
+    try:
+        started = rebuild_vector_store(store_name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "store": store_name.lower(),
+        "started": started,
+        "detail": "Rebuild started" if started else "Rebuild already in progress",
+    }
+
+
+@router.get("/index/status")
+def index_status():
+    return get_index_status()
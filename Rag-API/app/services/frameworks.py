@@ -1,7 +1,7 @@
 # app/services/framework_factory.py
-import subprocess
 from typing import Any
 from app.tools.run_command import run_command_tool
+from app.tools.docker_executor import docker_executor
 from Prompt.prompts import system_prompt
 from langgraph.prebuilt import create_react_agent
 
@@ -64,10 +64,7 @@ def get_agent(framework_name: str, llm, rag_chain):
             Executes a shell command (e.g., a Docker CLI command) and returns stdout/stderr.
             Raises a RuntimeError on non-zero exit codes.
             """
-            proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if proc.returncode != 0:
-                raise RuntimeError(f"Execution failed:\n{proc.stderr}")
-            return proc.stdout
+            return docker_executor.run(cmd)
         
 
         tools = [dspy_doc_qa, dspy_run_command]
@@ -99,10 +96,7 @@ def get_agent(framework_name: str, llm, rag_chain):
             Executes a shell command (e.g., a Docker CLI command) and returns stdout/stderr.
             Raises a RuntimeError on non-zero exit codes.
             """
-            proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            if proc.returncode != 0:
-                raise RuntimeError(f"Execution failed:\n{proc.stderr}")
-            return proc.stdout
+            return docker_executor.run(cmd)
         
 
         
@@ -1,5 +1,10 @@
+from functools import lru_cache
+
+import httpx
 from langchain.chat_models import init_chat_model
 
+from app.services.usage import usage_callback
+
 
 from llama_index.llms.openai import OpenAI
 #from langchain_google_genai import ChatGoogleGenerativeAI
@@ -14,6 +19,18 @@ else:
 
 from llama_index.llms.groq import Groq
 
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# One keep-alive pool shared by every chat model, so /ask doesn't pay for new TLS handshakes
+http_client = httpx.Client(
+    http2=HTTP2_AVAILABLE,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+    timeout=httpx.Timeout(120, connect=5)
+)
 
 
 def get_llama_index_llm(model_name: str):
@@ -57,32 +74,39 @@ def get_llama_index_llm(model_name: str):
 
 
 
+@lru_cache(maxsize=None)
 def get_llm(model_name: str):
     """
-    Returns an initialized chat LLM. 
+    Returns an initialized chat LLM, built once per model and then shared.
     Supported: "openai", "groq", "gemini", etc.
+    Every model reports its provider token usage through usage_callback.
     """
 
     if "gpt" in model_name:
-        return init_chat_model(model_name, model_provider="openai")
+        return init_chat_model(model_name, model_provider="openai", http_client=http_client,
+                               callbacks=[usage_callback], stream_usage=True)
 
     elif model_name == "llama3-8b-8192":
-        return init_chat_model("llama3-8b-8192", model_provider="groq")
+        return init_chat_model("llama3-8b-8192", model_provider="groq", http_client=http_client,
+                               callbacks=[usage_callback])
     
     elif model_name == "gemma2-9b-it":
-        return init_chat_model("gemma2-9b-it", model_provider="groq")
+        return init_chat_model("gemma2-9b-it", model_provider="groq", http_client=http_client,
+                               callbacks=[usage_callback])
     
     
     
     
     elif model_name == "llama-3.3-70b-versatile":
         # Replace "groq-llm-name" with actual Groq model identifier
-        return init_chat_model("llama-3.3-70b-versatile", model_provider="groq")
+        return init_chat_model("llama-3.3-70b-versatile", model_provider="groq", http_client=http_client,
+                               callbacks=[usage_callback])
 
 
     elif model_name == "gemini-2.0-flash":
         # Replace "gemini-llm-name" with actual Gemini identi
-        return init_chat_model("llama-3.3-70b-versatile", model_provider="groq")  ## 
+        return init_chat_model("llama-3.3-70b-versatile", model_provider="groq", http_client=http_client,
+                               callbacks=[usage_callback])  ## 
         #return ChatGoogleGenerativeAI(model="gemini-2.0-flash")
     else:
         raise ValueError(f"Unsupported LLM model: {model_name}")
@@ -0,0 +1,140 @@
+"""
+Provider-reported token usage.
+
+A callback attached to every LangChain chat model reads the usage the
+provider returned with each completion (usage_metadata, or the raw
+token_usage block), and an instrumentation handler does the same for
+LlamaIndex LLMs from the raw provider response. Both add it to the tracker
+of the request being served, so /ask can report what the whole agent run
+actually consumed: system prompt, retrieved context and tool messages
+included.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.events import BaseEvent
+from llama_index.core.instrumentation.events.llm import LLMChatEndEvent, LLMCompletionEndEvent
+
+
+def _field(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+class UsageTracker:
+    """Token totals for one request, per model and overall"""
+
+    def __init__(self):
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.calls = 0
+        self.models: Dict[str, Dict[str, int]] = {}
+        # Responses already counted, kept referenced so their ids stay unique
+        self._responses: Dict[Any, Any] = {}
+        self._lock = threading.Lock()
+
+    def add(self, model: str, input_tokens: int, output_tokens: int, response: Any = None):
+        with self._lock:
+            if response is not None:
+                key = _field(response, "id") or id(response)
+                if key in self._responses:
+                    return
+                self._responses[key] = response
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.calls += 1
+            per_model = self.models.setdefault(model, {"input_tokens": 0, "output_tokens": 0, "calls": 0})
+            per_model["input_tokens"] += input_tokens
+            per_model["output_tokens"] += output_tokens
+            per_model["calls"] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            if not self.calls:
+                return {}
+            return {
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens,
+                "calls": self.calls,
+                "models": {model: dict(counts) for model, counts in self.models.items()},
+            }
+
+
+_current_tracker: ContextVar[Optional[UsageTracker]] = ContextVar("usage_tracker", default=None)
+
+
+@contextmanager
+def track_usage():
+    """Collect the usage of every LLM call made while serving one request"""
+    tracker = UsageTracker()
+    token = _current_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _current_tracker.reset(token)
+
+
+def record_usage(model: str, input_tokens: int, output_tokens: int, response: Any = None):
+    """Add one call's usage; passing the provider response counts it only once"""
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        tracker.add(model, input_tokens, output_tokens, response)
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Records provider-reported usage of each completion into the current request's tracker"""
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        llm_output = response.llm_output or {}
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    model = (message.response_metadata or {}).get("model_name") or llm_output.get("model_name", "unknown")
+                    record_usage(model, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+                    found = True
+
+        # Older integrations only fill in the raw provider block
+        token_usage = llm_output.get("token_usage") or llm_output.get("usage")
+        if not found and token_usage:
+            record_usage(
+                llm_output.get("model_name", "unknown"),
+                token_usage.get("prompt_tokens", token_usage.get("input_tokens", 0)),
+                token_usage.get("completion_tokens", token_usage.get("output_tokens", 0)),
+            )
+
+
+class LlamaIndexUsageHandler(BaseEventHandler):
+    """Records the usage in each LlamaIndex LLM response's raw provider payload"""
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "LlamaIndexUsageHandler"
+
+    def handle(self, event: BaseEvent, **kwargs: Any) -> None:
+        if not isinstance(event, (LLMChatEndEvent, LLMCompletionEndEvent)) or event.response is None:
+            return
+        raw = event.response.raw
+        usage = _field(raw, "usage") if raw is not None else None
+        if usage:
+            record_usage(
+                _field(raw, "model") or "unknown",
+                _field(usage, "prompt_tokens") or _field(usage, "input_tokens") or 0,
+                _field(usage, "completion_tokens") or _field(usage, "output_tokens") or 0,
+                # chat() over complete() and async wrappers emit an end event per layer
+                response=raw,
+            )
+
+
+usage_callback = UsageCallbackHandler()
+
+# LlamaIndex LLMs take no per-model callback; every LLM event reaches the root dispatcher
+get_dispatcher().add_event_handler(LlamaIndexUsageHandler())
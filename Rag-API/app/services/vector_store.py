@@ -1,49 +1,180 @@
 import os
+import shutil
 import logging
-from typing import Any
+import threading
+from typing import Any, Dict
 
-from config import FAISS_INDEX_DIR, CHROMA_INDEX_DIR, embeddings
+from config import (
+    FAISS_INDEX_DIR,
+    CHROMA_INDEX_DIR,
+    INDEX_VERSIONS_TO_KEEP,
+    INDEX_VALIDATION_QUERY,
+    embeddings,
+)
 
 # Import your index-builders here
 from vector_stores.faiss_index import build_faiss_index
 from vector_stores.chroma_index import build_chroma_index
+from vector_stores.index_manifest import (
+    current_index_dir,
+    new_version_id,
+    prune_versions,
+    publish_version,
+    read_manifest,
+    staging_dir,
+)
 
 from langchain_community.vectorstores import FAISS, Chroma
 
 
+_BUILDERS = {
+    "faiss": build_faiss_index,
+    "chroma": build_chroma_index,
+}
+
+# Pre-versioning locations, still served if no version has been published yet
+_LEGACY_INDEX_DIRS = {
+    "faiss": FAISS_INDEX_DIR,
+    "chroma": CHROMA_INDEX_DIR,
+}
+
+# In-process cache of live stores; swapped wholesale when a rebuild is published
+_store_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+# One build at a time per store, whether it is a cold build or a background rebuild
+_build_locks = {name: threading.Lock() for name in _BUILDERS}
+_rebuild_state: Dict[str, Dict[str, Any]] = {
+    name: {"running": False, "last_error": None} for name in _BUILDERS
+}
+
+
+def _normalize_store_name(store_name: str) -> str:
+    name = store_name.lower()
+    if name == "annoy":
+        # Placeholder for Annoy implementation
+        raise ValueError("Annoy support not yet implemented")
+    if name not in _BUILDERS:
+        raise ValueError(f"Unsupported vector store: {store_name}")
+    return name
+
+
+def _load_store(name: str, index_dir: str) -> Any:
+    if name == "faiss":
+        return FAISS.load_local(
+            index_dir, embeddings, allow_dangerous_deserialization=True
+        )
+    return Chroma(persist_directory=index_dir, embedding_function=embeddings)
+
+
+def _resolve_index_dir(name: str):
+    index_dir = current_index_dir(name)
+    if index_dir:
+        return index_dir
+    if os.path.exists(_LEGACY_INDEX_DIRS[name]):
+        return _LEGACY_INDEX_DIRS[name]
+    return None
+
+
+def _validate_store(name: str, store: Any) -> int:
+    """
+    A freshly built store must answer a probe query before it is published.
+    """
+    docs = store.similarity_search(INDEX_VALIDATION_QUERY, k=1)
+    if not docs:
+        raise ValueError(f"New {name} index returned no results for validation query")
+    return len(docs)
+
+
+def _build_version(name: str) -> Any:
+    """
+    Builds a new version into a staging dir, validates it, publishes it and
+    returns the store loaded from its final location.
+    """
+    with _build_locks[name]:
+        version = new_version_id()
+        staging_path = staging_dir(name, version)
+        try:
+            store = _BUILDERS[name](staging_path)
+            _validate_store(name, store)
+            del store
+            final_path = publish_version(name, staging_path, version)
+        except Exception:
+            shutil.rmtree(staging_path, ignore_errors=True)
+            raise
+
+        prune_versions(name, INDEX_VERSIONS_TO_KEEP)
+        return _load_store(name, final_path)
+
+
 def get_vector_store(store_name: str) -> Any:
     """
-    Returns a loaded or newly-built vector store instance 
+    Returns a loaded or newly-built vector store instance
     based on `store_name` ("faiss", "chroma", "annoy", etc.).
+    Stores are cached per process; rebuilds go through `rebuild_vector_store`.
     """
-    if store_name.lower() == "faiss":
-        if os.path.exists(FAISS_INDEX_DIR):
-            logging.info("Loading existing FAISS index…")
-            return FAISS.load_local(
-                FAISS_INDEX_DIR, embeddings, allow_dangerous_deserialization=True
-            )
-        else:
-            return build_faiss_index()
-
-    elif store_name == "chroma":
-        # If the folder exists, simply re-instantiate Chroma pointing at that folder.
-        if os.path.exists(CHROMA_INDEX_DIR):
-            logging.info("Loading existing Chroma index…")
-            return Chroma(
-                persist_directory=CHROMA_INDEX_DIR,
-                embedding_function=embeddings
-            )
+    name = _normalize_store_name(store_name)
+
+    store = _store_cache.get(name)
+    if store is not None:
+        return store
+
+    with _cache_lock:
+        store = _store_cache.get(name)
+        if store is not None:
+            return store
+
+        index_dir = _resolve_index_dir(name)
+        if index_dir:
+            logging.info(f"Loading existing {name} index from {index_dir}…")
+            store = _load_store(name, index_dir)
         else:
-            logging.info("Chroma index not found. Building a new one…")
-            new_db = build_chroma_index()
-           
-            return new_db
+            logging.info(f"{name} index not found. Building a new one…")
+            store = _build_version(name)
 
-    elif store_name == "annoy":
-        # Placeholder for Annoy implementation
-        raise ValueError("Annoy support not yet implemented")
-    else:
-        raise ValueError(f"Unsupported vector store: {store_name}")
+        _store_cache[name] = store
+        return store
+
+
+def _run_rebuild(name: str):
+    try:
+        store = _build_version(name)
+        with _cache_lock:
+            _store_cache[name] = store
+        _rebuild_state[name]["last_error"] = None
+        logging.info(f"{name} index rebuilt and swapped in")
+    except Exception as e:
+        logging.exception(f"Background rebuild of {name} index failed; keeping current version.")
+        _rebuild_state[name]["last_error"] = str(e)
+    finally:
+        _rebuild_state[name]["running"] = False
+
+
+def rebuild_vector_store(store_name: str) -> bool:
+    """
+    Starts a background rebuild. The current version keeps serving until the
+    new one is validated and published. Returns False if a rebuild is already running.
+    """
+    name = _normalize_store_name(store_name)
+
+    with _cache_lock:
+        if _rebuild_state[name]["running"]:
+            return False
+        _rebuild_state[name]["running"] = True
 
+    threading.Thread(
+        target=_run_rebuild, args=(name,), name=f"rebuild-{name}-index", daemon=True
+    ).start()
+    return True
 
 
+def get_index_status() -> Dict[str, Any]:
+    return {
+        name: {
+            "loaded": name in _store_cache,
+            "manifest": read_manifest(name),
+            "rebuild_running": state["running"],
+            "last_error": state["last_error"],
+        }
+        for name, state in _rebuild_state.items()
+    }
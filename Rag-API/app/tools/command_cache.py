@@ -0,0 +1,98 @@
+"""
+Command result cache.
+
+Agents re-run the same inspection commands (docker ps, images, version,
+info) after nearly every answer. Their output is kept for a short,
+per-command TTL and shared by every agent in the process. Any command that
+changes daemon state drops the whole cache, so a `docker run` is never
+followed by a stale `docker ps`.
+"""
+import re
+import shlex
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+# Seconds a result stays valid, by normalized command prefix
+CACHE_TTLS = {
+    ("docker", "ps"): 2.0,
+    ("docker", "container", "ls"): 2.0,
+    ("docker", "container", "list"): 2.0,
+    ("docker", "images"): 10.0,
+    ("docker", "image", "ls"): 10.0,
+    ("docker", "image", "list"): 10.0,
+    ("docker", "info"): 30.0,
+    ("docker", "system", "info"): 30.0,
+    ("docker", "version"): 300.0,
+}
+
+# Subcommands that change containers, images, volumes or networks
+MUTATING_COMMAND = re.compile(
+    r"\bdocker(?:-compose|\s+compose)?\s+(?:(?:container|image|volume|network|system|builder)\s+)?"
+    r"(?:run|create|start|stop|restart|kill|pause|unpause|rm|rmi|prune|pull|build|load|import|"
+    r"commit|tag|untag|rename|update|up|down|exec)\b",
+    re.IGNORECASE
+)
+
+
+class CommandCache:
+    """Per-command TTL cache for read-only Docker command output"""
+
+    def __init__(self, ttls: Optional[Dict[Tuple[str, ...], float]] = None):
+        self.ttls = CACHE_TTLS if ttls is None else ttls
+        self._entries: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        # Bumped on invalidation so results read before a mutation aren't stored after it
+        self.generation = 0
+
+    def key_for(self, cmd: str) -> Optional[Tuple[str, float]]:
+        """(cache key, ttl) for an allowlisted command, or None if it must always run"""
+        if any(ch in "|&;<>$`\n" for ch in cmd):
+            return None
+        try:
+            argv = shlex.split(cmd)
+        except ValueError:
+            return None
+        for prefix, ttl in self.ttls.items():
+            if tuple(argv[:len(prefix)]) == prefix:
+                return " ".join(argv), ttl
+        return None
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.hits += 1
+                return cached[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key: str, output: str, ttl: float, generation: int):
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = (time.monotonic() + ttl, output)
+
+    def invalidate_if_mutating(self, cmd: str) -> bool:
+        """Drop every cached result if `cmd` can change daemon state"""
+        if not MUTATING_COMMAND.search(cmd):
+            return False
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+            self.generation += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,171 @@
+"""
+Bounded command execution.
+
+Commands run in their own session with stdout streamed incrementally.
+Reading stops at a byte or line budget, a wall-clock timeout kills the
+whole process group, and output handed to the LLM is cut down to a token
+budget. Every truncation is recorded against the current request so the
+caller can report it in its trace.
+"""
+import os
+import selectors
+import signal
+import subprocess
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+COMMAND_TIMEOUT = 30.0
+MAX_OUTPUT_BYTES = 1024 * 1024
+MAX_OUTPUT_LINES = 5000
+MAX_STDERR_BYTES = 64 * 1024
+
+# Output that reaches the LLM, estimated at ~4 characters per token
+LLM_TOKEN_BUDGET = 2000
+CHARS_PER_TOKEN = 4
+
+_truncations: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("command_truncations", default=None)
+
+
+class CommandOutput:
+    """What a bounded run produced"""
+
+    def __init__(self, stdout: str, stderr: str, returncode: Optional[int],
+                 timed_out: bool, truncated: Optional[str], bytes_read: int, lines_read: int):
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode = returncode
+        self.timed_out = timed_out
+        # "bytes" or "lines" when reading stopped at a budget
+        self.truncated = truncated
+        self.bytes_read = bytes_read
+        self.lines_read = lines_read
+
+
+@contextmanager
+def track_truncations():
+    """Collect the truncations recorded while serving one request"""
+    records: List[Dict[str, Any]] = []
+    token = _truncations.set(records)
+    try:
+        yield records
+    finally:
+        _truncations.reset(token)
+
+
+def record_truncation(cmd: str, reason: str, **details):
+    records = _truncations.get()
+    if records is not None:
+        records.append({"command": cmd, "reason": reason, **details})
+
+
+def _kill_group(proc: subprocess.Popen):
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def run_bounded(cmd: str, timeout: float = COMMAND_TIMEOUT,
+                max_bytes: int = MAX_OUTPUT_BYTES, max_lines: int = MAX_OUTPUT_LINES) -> CommandOutput:
+    """Run `cmd` through the shell, reading at most `max_bytes`/`max_lines` of stdout within `timeout`"""
+    proc = subprocess.Popen(cmd, shell=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, start_new_session=True)
+    deadline = time.monotonic() + timeout
+    stdout, stderr = bytearray(), bytearray()
+    lines = 0
+    truncated = None
+    timed_out = False
+
+    selector = selectors.DefaultSelector()
+    selector.register(proc.stdout, selectors.EVENT_READ, "stdout")
+    selector.register(proc.stderr, selectors.EVENT_READ, "stderr")
+    try:
+        while selector.get_map() and not truncated:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                if key.data == "stderr":
+                    # Keep draining so the process never blocks on a full pipe
+                    stderr += chunk[:max(0, MAX_STDERR_BYTES - len(stderr))]
+                    continue
+
+                if len(stdout) + len(chunk) > max_bytes:
+                    chunk = chunk[:max_bytes - len(stdout)]
+                    truncated = "bytes"
+                newlines = chunk.count(b"\n")
+                if lines + newlines > max_lines:
+                    cut = -1
+                    for _ in range(max_lines - lines):
+                        cut = chunk.index(b"\n", cut + 1)
+                    chunk = chunk[:cut + 1]
+                    newlines = max_lines - lines
+                    truncated = "lines"
+                stdout += chunk
+                lines += newlines
+                if truncated:
+                    break
+    finally:
+        selector.close()
+        if timed_out or truncated:
+            # Children may still hold the pipes open; take the whole group down
+            _kill_group(proc)
+        proc.stdout.close()
+        proc.stderr.close()
+        try:
+            # A child can close its stdio and keep running; don't wait past the deadline for it
+            proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            _kill_group(proc)
+            proc.wait()
+
+    return CommandOutput(
+        stdout=stdout.decode("utf-8", errors="replace"),
+        stderr=stderr.decode("utf-8", errors="replace"),
+        returncode=proc.returncode,
+        timed_out=timed_out,
+        truncated=truncated,
+        bytes_read=len(stdout),
+        lines_read=lines,
+    )
+
+
+def fit_to_token_budget(text: str, max_tokens: int = LLM_TOKEN_BUDGET) -> Tuple[str, int]:
+    """
+    Keep the head and tail of `text` within roughly `max_tokens`, on line
+    boundaries. Returns (text, number of lines omitted).
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text, 0
+
+    lines = text.splitlines(keepends=True)
+    # The end of logs is usually what matters, so the tail gets the larger share
+    head_chars, tail_chars = max_chars * 2 // 5, max_chars * 3 // 5
+    head, used = [], 0
+    for line in lines:
+        if used + len(line) > head_chars:
+            break
+        head.append(line)
+        used += len(line)
+    tail, used = [], 0
+    for line in reversed(lines[len(head):]):
+        if used + len(line) > tail_chars:
+            break
+        tail.append(line)
+        used += len(line)
+    tail.reverse()
+
+    omitted = len(lines) - len(head) - len(tail)
+    if not head and not tail:
+        # A single enormous line
+        return text[:head_chars] + "\n... [output truncated] ...\n" + text[-tail_chars:], 1
+    return "".join(head) + f"... [{omitted} lines omitted] ...\n" + "".join(tail), omitted
@@ -0,0 +1,371 @@
+"""
+Docker command executor.
+
+Common read-only commands (ps, images, version, info, logs, inspect) are
+parsed and served through one persistent Docker SDK client, so a tool call
+costs a single API round trip over the daemon socket instead of a shell,
+a `docker` CLI fork and a fresh daemon handshake. Anything else - other
+commands, unknown flags, pipes or redirects - falls back to the CLI.
+Inspection results are shared through a short-lived CommandCache, and
+all output is bounded before it is returned to the LLM.
+"""
+import json
+import logging
+import shlex
+import threading
+import time
+from typing import Callable, List, Optional
+
+try:
+    import docker
+    from docker.errors import APIError, DockerException, NotFound
+    from requests.exceptions import ConnectionError as RequestsConnectionError
+except ImportError:  # SDK not installed; everything goes through the CLI
+    docker = None
+
+from .command_cache import CommandCache
+from .command_runner import (
+    COMMAND_TIMEOUT, MAX_OUTPUT_BYTES, MAX_OUTPUT_LINES,
+    fit_to_token_budget, record_truncation, run_bounded
+)
+
+logger = logging.getLogger(__name__)
+
+# Characters that need a real shell to mean what the caller intended
+SHELL_METACHARACTERS = set("|&;<>$`\n")
+
+# Don't retry a missing or unreachable daemon on every call
+SDK_RETRY_INTERVAL = 30.0
+
+COMMAND_ALIASES = {
+    ("container", "ls"): "ps",
+    ("container", "list"): "ps",
+    ("container", "ps"): "ps",
+    ("container", "logs"): "logs",
+    ("container", "inspect"): "inspect",
+    ("image", "ls"): "images",
+    ("image", "list"): "images",
+    ("image", "inspect"): "inspect",
+    ("system", "info"): "info",
+}
+
+
+def _human_duration(seconds: float) -> str:
+    """Relative time the way the Docker CLI prints it"""
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return "Less than a minute"
+    for unit, size in (("week", 604800), ("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = seconds // size
+            if count == 1:
+                return "About an hour" if unit == "hour" else f"1 {unit}"
+            return f"{count} {unit}s"
+    return f"{seconds} seconds"
+
+
+def _human_size(size: int) -> str:
+    """Decimal sizes with 3 significant digits, like the Docker CLI"""
+    for unit in ("B", "kB", "MB", "GB", "TB"):
+        if size < 1000 or unit == "TB":
+            return f"{size:.3g}{unit}"
+        size /= 1000.0
+
+
+def _table(headers: List[str], rows: List[List[str]]) -> str:
+    """Left-aligned columns separated by three spaces"""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    lines = [
+        "   ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in [headers] + rows
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _expand_flags(args: List[str]) -> List[str]:
+    """Split combined short flags (-aq -> -a -q)"""
+    expanded = []
+    for arg in args:
+        if arg.startswith("-") and not arg.startswith("--") and len(arg) > 2:
+            expanded.extend(f"-{flag}" for flag in arg[1:])
+        else:
+            expanded.append(arg)
+    return expanded
+
+
+class DockerCommandExecutor:
+    """Runs Docker commands over a shared SDK client, with a CLI fallback"""
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = COMMAND_TIMEOUT,
+                 cache: Optional[CommandCache] = None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else CommandCache()
+        self._client = None
+        self._client_failed_at = 0.0
+        self._lock = threading.Lock()
+        self._parsers = {
+            "ps": self._parse_ps,
+            "images": self._parse_images,
+            "version": self._parse_version,
+            "info": self._parse_info,
+            "logs": self._parse_logs,
+            "inspect": self._parse_inspect,
+        }
+
+    def _get_client(self):
+        """The persistent low-level API client, or None if the SDK can't reach a daemon"""
+        if docker is None:
+            return None
+        if self._client is not None:
+            return self._client
+
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            if time.time() - self._client_failed_at < SDK_RETRY_INTERVAL:
+                return None
+            try:
+                if self.base_url:
+                    client = docker.APIClient(base_url=self.base_url, timeout=self.timeout, version="auto")
+                else:
+                    client = docker.APIClient(timeout=self.timeout, version="auto",
+                                              **docker.utils.kwargs_from_env())
+                self._client = client
+            except DockerException as e:
+                logger.warning("Docker SDK unavailable, using the CLI: %s", e)
+                self._client_failed_at = time.time()
+            return self._client
+
+    def parse(self, cmd: str) -> Optional[Callable]:
+        """Map a command to an SDK call; None means it has to go to the CLI"""
+        if any(ch in SHELL_METACHARACTERS for ch in cmd):
+            return None
+        try:
+            argv = shlex.split(cmd)
+        except ValueError:
+            return None
+        if len(argv) < 2 or argv[0] != "docker":
+            return None
+
+        argv = argv[1:]
+        alias = COMMAND_ALIASES.get(tuple(argv[:2]))
+        if alias:
+            argv = [alias] + argv[2:]
+
+        parser = self._parsers.get(argv[0])
+        return parser(_expand_flags(argv[1:])) if parser else None
+
+    def _parse_ps(self, args: List[str]) -> Optional[Callable]:
+        show_all = quiet = no_trunc = False
+        for arg in args:
+            if arg in ("-a", "--all"):
+                show_all = True
+            elif arg in ("-q", "--quiet"):
+                quiet = True
+            elif arg == "--no-trunc":
+                no_trunc = True
+            else:
+                return None
+        return lambda client: self._ps(client, show_all, quiet, no_trunc)
+
+    def _parse_images(self, args: List[str]) -> Optional[Callable]:
+        show_all = quiet = False
+        for arg in args:
+            if arg in ("-a", "--all"):
+                show_all = True
+            elif arg in ("-q", "--quiet"):
+                quiet = True
+            else:
+                return None
+        return lambda client: self._images(client, show_all, quiet)
+
+    def _parse_version(self, args: List[str]) -> Optional[Callable]:
+        return None if args else self._version
+
+    def _parse_info(self, args: List[str]) -> Optional[Callable]:
+        return None if args else self._info
+
+    def _parse_logs(self, args: List[str]) -> Optional[Callable]:
+        tail, timestamps, container = "all", False, None
+        args = list(args)
+        while args:
+            arg = args.pop(0)
+            if arg in ("-t", "--timestamps"):
+                timestamps = True
+            elif arg in ("-n", "--tail") and args:
+                tail = args.pop(0)
+            elif arg.startswith("--tail="):
+                tail = arg.split("=", 1)[1]
+            elif not arg.startswith("-") and container is None:
+                container = arg
+            else:
+                # --follow, --since etc. keep their exact CLI behaviour
+                return None
+        if container is None or (tail != "all" and not tail.isdigit()):
+            return None
+        tail = tail if tail == "all" else int(tail)
+        return lambda client: self._logs(client, container, tail, timestamps)
+
+    def _parse_inspect(self, args: List[str]) -> Optional[Callable]:
+        if not args or any(arg.startswith("-") for arg in args):
+            return None
+        return lambda client: self._inspect(client, args)
+
+    def _ps(self, client, show_all: bool, quiet: bool, no_trunc: bool) -> str:
+        containers = client.containers(all=show_all)
+        if quiet:
+            return "".join(f"{c['Id'] if no_trunc else c['Id'][:12]}\n" for c in containers)
+
+        now = time.time()
+        rows = []
+        for c in containers:
+            command = c.get("Command", "")
+            if not no_trunc and len(command) > 20:
+                command = command[:19] + "…"
+            ports = ", ".join(
+                f"{p['IP']}:{p['PublicPort']}->{p['PrivatePort']}/{p['Type']}" if p.get("PublicPort")
+                else f"{p['PrivatePort']}/{p['Type']}"
+                for p in c.get("Ports", [])
+            )
+            rows.append([
+                c["Id"] if no_trunc else c["Id"][:12],
+                c.get("Image", ""),
+                f'"{command}"',
+                f"{_human_duration(now - c.get('Created', now))} ago",
+                c.get("Status", ""),
+                ports,
+                ",".join(name.lstrip("/") for name in c.get("Names", [])),
+            ])
+        return _table(["CONTAINER ID", "IMAGE", "COMMAND", "CREATED", "STATUS", "PORTS", "NAMES"], rows)
+
+    def _images(self, client, show_all: bool, quiet: bool) -> str:
+        images = client.images(all=show_all)
+        if quiet:
+            return "".join(f"{image['Id'].split(':', 1)[-1][:12]}\n" for image in images)
+
+        now = time.time()
+        rows = []
+        for image in images:
+            image_id = image["Id"].split(":", 1)[-1][:12]
+            created = f"{_human_duration(now - image.get('Created', now))} ago"
+            size = _human_size(image.get("Size", 0))
+            for repo_tag in image.get("RepoTags") or ["<none>:<none>"]:
+                repository, _, tag = repo_tag.rpartition(":")
+                rows.append([repository, tag, image_id, created, size])
+        return _table(["REPOSITORY", "TAG", "IMAGE ID", "CREATED", "SIZE"], rows)
+
+    def _version(self, client) -> str:
+        version = client.version()
+        lines = [f"Server: {version.get('Platform', {}).get('Name', 'Docker Engine')}"]
+        for key, label in (("Version", "Version"), ("ApiVersion", "API version"),
+                           ("MinAPIVersion", "Minimum API version"), ("GoVersion", "Go version"),
+                           ("GitCommit", "Git commit"), ("BuildTime", "Built"),
+                           ("Os", "OS"), ("Arch", "Arch")):
+            if key in version:
+                lines.append(f" {label}: {version[key]}")
+        return "\n".join(lines) + "\n"
+
+    def _info(self, client) -> str:
+        info = client.info()
+        lines = []
+        for key, label in (("Containers", "Containers"), ("ContainersRunning", " Running"),
+                           ("ContainersPaused", " Paused"), ("ContainersStopped", " Stopped"),
+                           ("Images", "Images"), ("ServerVersion", "Server Version"),
+                           ("Driver", "Storage Driver"), ("OperatingSystem", "Operating System"),
+                           ("OSType", "OSType"), ("Architecture", "Architecture"),
+                           ("NCPU", "CPUs"), ("Name", "Name")):
+            if key in info:
+                lines.append(f"{label}: {info[key]}")
+        if "MemTotal" in info:
+            lines.append(f"Total Memory: {info['MemTotal'] / 1024 ** 3:.2f}GiB")
+        return "\n".join(lines) + "\n"
+
+    def _logs(self, client, container: str, tail, timestamps: bool) -> str:
+        # Let the daemon apply the line budget, keeping the most recent lines
+        limit = MAX_OUTPUT_LINES if tail == "all" else min(tail, MAX_OUTPUT_LINES)
+        output = client.logs(container, stdout=True, stderr=True, tail=limit, timestamps=timestamps)
+        if limit != tail and output.count(b"\n") >= limit:
+            record_truncation(f"docker logs {container}", "lines", lines_read=limit)
+        if len(output) > MAX_OUTPUT_BYTES:
+            record_truncation(f"docker logs {container}", "bytes", bytes_read=MAX_OUTPUT_BYTES)
+            output = output[-MAX_OUTPUT_BYTES:]
+        return output.decode("utf-8", errors="replace")
+
+    def _inspect(self, client, names: List[str]) -> str:
+        results = []
+        for name in names:
+            try:
+                results.append(client.inspect_container(name))
+            except NotFound:
+                results.append(client.inspect_image(name))
+        return json.dumps(results, indent=4) + "\n"
+
+    def run_cli(self, cmd: str) -> str:
+        """Execute through the shell with bounded output and a wall-clock timeout"""
+        result = run_bounded(cmd, timeout=self.timeout)
+        if result.timed_out:
+            record_truncation(cmd, "timeout", timeout=self.timeout, bytes_read=result.bytes_read)
+            partial = fit_to_token_budget(result.stderr or result.stdout)[0]
+            raise RuntimeError(f"Execution timed out after {self.timeout:g}s:\n{partial}")
+        if result.truncated:
+            # We killed it; the exit status says nothing about the command
+            record_truncation(cmd, result.truncated, bytes_read=result.bytes_read, lines_read=result.lines_read)
+            return result.stdout
+        if result.returncode != 0:
+            raise RuntimeError(f"Execution failed:\n{fit_to_token_budget(result.stderr)[0]}")
+        return result.stdout
+
+    def run(self, cmd: str) -> str:
+        """
+        Execute a Docker command and return its output, trimmed to the LLM
+        token budget and served from the cache when a recent result exists.
+        Raises a RuntimeError if the command fails or times out.
+        """
+        output = self._run_cached(cmd)
+        fitted, omitted = fit_to_token_budget(output)
+        if omitted:
+            record_truncation(cmd, "tokens", lines_omitted=omitted, chars=len(output))
+        return fitted
+
+    def _run_cached(self, cmd: str) -> str:
+        cacheable = self.cache.key_for(cmd)
+        if cacheable:
+            key, ttl = cacheable
+            output = self.cache.get(key)
+            if output is not None:
+                return output
+            generation = self.cache.generation
+
+        try:
+            output = self._execute(cmd)
+        finally:
+            # Even a failed run/rm may have changed something
+            self.cache.invalidate_if_mutating(cmd)
+
+        if cacheable:
+            self.cache.set(key, output, ttl, generation)
+        return output
+
+    def _execute(self, cmd: str) -> str:
+        handler = self.parse(cmd)
+        client = self._get_client() if handler else None
+        if client is None:
+            return self.run_cli(cmd)
+
+        try:
+            return handler(client)
+        except NotFound as e:
+            raise RuntimeError(f"Execution failed:\nError response from daemon: {e.explanation}") from e
+        except APIError as e:
+            raise RuntimeError(f"Execution failed:\nError response from daemon: {e.explanation or e}") from e
+        except (DockerException, RequestsConnectionError) as e:
+            # Daemon went away under us; let the CLI report it the usual way
+            logger.warning("Docker SDK call failed, retrying with the CLI: %s", e)
+            with self._lock:
+                self._client = None
+                self._client_failed_at = time.time()
+            return self.run_cli(cmd)
+
+
+docker_executor = DockerCommandExecutor()
@@ -1,5 +1,5 @@
-import subprocess
 from langchain.tools import tool
+from app.tools.docker_executor import docker_executor
 
 @tool
 def run_command_tool(cmd: str) -> str:
@@ -7,7 +7,4 @@ def run_command_tool(cmd: str) -> str:
     Executes a shell command (e.g., a Docker CLI command) and returns stdout/stderr.
     Raises a RuntimeError on non-zero exit codes.
     """
-    proc = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError(f"Execution failed:\n{proc.stderr}")
-    return proc.stdout
+    return docker_executor.run(cmd)
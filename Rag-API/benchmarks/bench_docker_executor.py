@@ -0,0 +1,179 @@
+"""
+Benchmark: Docker SDK executor vs. shell + CLI for read-only tool calls.
+
+Starts a stand-in Docker daemon (canned Engine API responses over a Unix
+socket) so the numbers measure the client side only: one pooled API round
+trip for the SDK path against shell + `docker` fork/exec + handshake for the
+CLI path. If the docker CLI is not installed, the same request is made with
+`curl --unix-socket` from a shell instead: a lower bound, since curl starts
+much faster than the docker binary. The last column is a warm hit on the
+shared command cache, for the commands it allowlists.
+
+Run from the Rag-API directory:
+
+    python -m benchmarks.bench_docker_executor --iterations 200
+"""
+import argparse
+import http.server
+import json
+import os
+import re
+import shutil
+import socketserver
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+
+from app.tools.command_cache import CommandCache
+from app.tools.docker_executor import DockerCommandExecutor
+
+NOW = int(time.time())
+
+CONTAINER = {
+    "Id": "4f1c2b9a7e3d" + "0" * 52,
+    "Names": ["/web"],
+    "Image": "nginx:latest",
+    "Command": "/docker-entrypoint.sh nginx -g 'daemon off;'",
+    "Created": NOW - 7200,
+    "Status": "Up 2 hours",
+    "State": "running",
+    "Ports": [{"IP": "0.0.0.0", "PrivatePort": 80, "PublicPort": 8080, "Type": "tcp"}],
+}
+
+ROUTES = {
+    "/_ping": "OK",
+    "/version": {
+        "Platform": {"Name": "Docker Engine - Community"},
+        "Version": "26.1.0", "ApiVersion": "1.45", "MinAPIVersion": "1.24",
+        "GoVersion": "go1.21.9", "Os": "linux", "Arch": "amd64",
+    },
+    "/info": {
+        "Containers": 1, "ContainersRunning": 1, "ContainersPaused": 0, "ContainersStopped": 0,
+        "Images": 1, "ServerVersion": "26.1.0", "Driver": "overlay2",
+        "OperatingSystem": "Stand-in", "OSType": "linux", "Architecture": "x86_64",
+        "NCPU": 8, "MemTotal": 16 * 1024 ** 3, "Name": "bench",
+    },
+    "/containers/json": [CONTAINER],
+    "/images/json": [{
+        "Id": "sha256:" + "a" * 64, "RepoTags": ["nginx:latest"],
+        "Created": NOW - 86400 * 3, "Size": 187_000_000,
+    }],
+    "/containers/web/json": dict(CONTAINER, Config={"Tty": True}),
+    "/containers/web/logs": "\n".join(f"log line {i}" for i in range(50)) + "\n",
+}
+
+
+# Engine API request behind each benchmarked command, for the curl baseline
+CURL_PATHS = {
+    "docker ps": "/containers/json",
+    "docker images": "/images/json",
+    "docker version": "/version",
+    "docker info": "/info",
+    "docker logs --tail 20 web": "/containers/web/logs",
+    "docker inspect web": "/containers/web/json",
+}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real daemon
+
+    def do_GET(self):
+        path = re.sub(r"^/v[\d.]+", "", self.path.split("?", 1)[0])
+        payload = ROUTES.get(path)
+        if payload is None:
+            body, status, content_type = b'{"message": "not found"}', 404, "application/json"
+        elif isinstance(payload, str):
+            body, status, content_type = payload.encode(), 200, "text/plain"
+        else:
+            body, status, content_type = json.dumps(payload).encode(), 200, "application/json"
+
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def address_string(self):
+        return "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _StandInDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def _time_calls(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.mean(samples),
+        "p50": samples[len(samples) // 2],
+        "p95": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    socket_dir = tempfile.mkdtemp(prefix="docker-bench-")
+    socket_path = os.path.join(socket_dir, "docker.sock")
+    server = _StandInDaemon(socket_path, _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f"unix://{socket_path}"
+    executor = DockerCommandExecutor(base_url=base_url, cache=CommandCache(ttls={}))
+    cached_executor = DockerCommandExecutor(base_url=base_url)
+    commands = list(CURL_PATHS)
+
+    docker_cli = shutil.which("docker")
+    env = dict(os.environ, DOCKER_HOST=base_url)
+    if docker_cli:
+        cli_label = "shell + docker CLI"
+    else:
+        cli_label = "shell + curl over the socket (docker CLI not installed; lower bound)"
+
+    print(f"{args.iterations} iterations per command; CLI baseline: {cli_label}\n")
+    print(f"{'command':<28}{'SDK p50':>10}{'SDK p95':>10}{'CLI p50':>10}{'CLI p95':>10}"
+          f"{'speedup':>10}{'cached p50':>12}")
+
+    try:
+        for cmd in commands:
+            executor.run(cmd)  # connect and negotiate the API version once
+            sdk = _time_calls(lambda: executor.run(cmd), args.iterations)
+
+            shell_cmd = cmd if docker_cli else (
+                f"curl -s --unix-socket {socket_path} http://localhost/v1.45{CURL_PATHS[cmd]}"
+            )
+            cli = _time_calls(
+                lambda: subprocess.run(shell_cmd, shell=True, capture_output=True, text=True, env=env),
+                args.iterations
+            )
+
+            if cached_executor.cache.key_for(cmd):
+                cached_executor.run(cmd)
+                cached = f"{_time_calls(lambda: cached_executor.run(cmd), args.iterations)['p50'] * 1000:>10.1f}us"
+            else:
+                cached = f"{'-':>12}"
+
+            print(f"{cmd:<28}{sdk['p50']:>8.2f}ms{sdk['p95']:>8.2f}ms"
+                  f"{cli['p50']:>8.2f}ms{cli['p95']:>8.2f}ms{cli['mean'] / sdk['mean']:>9.1f}x{cached}")
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
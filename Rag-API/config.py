@@ -25,6 +25,26 @@ DATA_DIR = 'Rag-API\data'
 FAISS_INDEX_DIR = "vector_data/faiss_index"
 CHROMA_INDEX_DIR = "vector_data/chroma_index"
 
+# Versioned indexes live in vector_data/<store>/versions/<version>/ and the
+# CURRENT manifest next to them points at the version being served.
+INDEX_ROOT_DIR = "vector_data"
+INDEX_VERSIONS_TO_KEEP = 2
+INDEX_VALIDATION_QUERY = "docker ps"
+
+# Docker CLI reference pages indexed alongside the PDFs. Builds read them from
+# the local snapshot store; set WEB_SNAPSHOT_REFRESH=true to re-fetch first.
+CLI_DOC_URLS = [
+    "https://docs.docker.com/engine/reference/commandline/ps/",
+    "https://docs.docker.com/engine/reference/commandline/logs/",
+    "https://docs.docker.com/engine/reference/commandline/stop/",
+    "https://docs.docker.com/engine/reference/commandline/images_prune/",
+    "https://docs.docker.com/engine/reference/commandline/service_scale/"
+]
+WEB_SNAPSHOT_DIR = "vector_data/web_snapshots"
+WEB_SNAPSHOT_REFRESH = os.getenv("WEB_SNAPSHOT_REFRESH", "false").lower() == "true"
+WEB_FETCH_WORKERS = 5
+WEB_FETCH_TIMEOUT = 10
+
 # If you have specific embedding objects, import or configure them here:
 # e.g. embeddings = OpenAIEmbeddings(...)
 from langchain_openai import OpenAIEmbeddings
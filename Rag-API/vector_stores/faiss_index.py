@@ -1,12 +1,13 @@
-from langchain_community.document_loaders import PyPDFDirectoryLoader, WebBaseLoader
+from langchain_community.document_loaders import PyPDFDirectoryLoader
 from langchain_community.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 import logging
 from config import DATA_DIR, FAISS_INDEX_DIR, OPENAI_API_KEY, embeddings
+from vector_stores.web_snapshot import load_cli_docs
 
 logging.basicConfig(level=logging.INFO)
 
-def build_faiss_index():
+def build_faiss_index(index_dir: str = FAISS_INDEX_DIR):
     logging.info("Building new FAISS index from PDFs and Docker CLI docs…")
 
     # Load PDFs
@@ -18,17 +19,9 @@ def build_faiss_index():
         logging.error(f"Failed to load PDFs: {e}")
         pdf_docs = []
 
-    # Load Docker CLI Docs from Web
-    cli_urls = [
-        "https://docs.docker.com/engine/reference/commandline/ps/",
-        "https://docs.docker.com/engine/reference/commandline/logs/",
-        "https://docs.docker.com/engine/reference/commandline/stop/",
-        "https://docs.docker.com/engine/reference/commandline/images_prune/",
-        "https://docs.docker.com/engine/reference/commandline/service_scale/"
-    ]
+    # Load Docker CLI Docs from the local web snapshot
     try:
-        cli_loader = WebBaseLoader(web_paths=tuple(cli_urls))
-        cli_docs = cli_loader.load()
+        cli_docs = load_cli_docs()
         logging.info(f"Loaded {len(cli_docs)} CLI documents.")
     except Exception as e:
         logging.warning(f"Failed to load CLI docs: {e}")
@@ -49,8 +42,8 @@ def build_faiss_index():
     # Build and save FAISS index
     try:
         db = FAISS.from_documents(split_docs, embeddings)
-        db.save_local(FAISS_INDEX_DIR)
-        logging.info(f"FAISS index built and saved to {FAISS_INDEX_DIR}")
+        db.save_local(index_dir)
+        logging.info(f"FAISS index built and saved to {index_dir}")
         return db
     except Exception as e:
         logging.exception("Failed to build or save FAISS index.")
@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config import INDEX_ROOT_DIR
+
+MANIFEST_NAME = "CURRENT"
+STAGING_SUFFIX = ".staging"
+
+
+def store_root(store_name: str) -> str:
+    return os.path.join(INDEX_ROOT_DIR, store_name)
+
+
+def versions_dir(store_name: str) -> str:
+    return os.path.join(store_root(store_name), "versions")
+
+
+def manifest_path(store_name: str) -> str:
+    return os.path.join(store_root(store_name), MANIFEST_NAME)
+
+
+def new_version_id() -> str:
+    """
+    Version ids are UTC timestamps, so lexical order is build order.
+    """
+    return datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+
+
+def staging_dir(store_name: str, version: str) -> str:
+    """
+    Directory a new version is built into before it is published.
+    Lives next to the published versions so the final rename stays on one filesystem.
+    """
+    path = os.path.join(versions_dir(store_name), f"{version}{STAGING_SUFFIX}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def read_manifest(store_name: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(manifest_path(store_name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.warning(f"Unreadable {store_name} index manifest: {e}")
+        return None
+
+
+def current_index_dir(store_name: str) -> Optional[str]:
+    """
+    Returns the directory of the live version, or None if nothing has been published.
+    """
+    manifest = read_manifest(store_name)
+    if not manifest:
+        return None
+    path = os.path.join(versions_dir(store_name), manifest["version"])
+    return path if os.path.isdir(path) else None
+
+
+def publish_version(store_name: str, staging_path: str, version: str,
+                    metadata: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Moves a validated staging directory into place and atomically repoints the manifest.
+    Readers see either the old version or the new one, never a partial build.
+    """
+    final_path = os.path.join(versions_dir(store_name), version)
+    os.rename(staging_path, final_path)
+
+    manifest = {
+        "store": store_name,
+        "version": version,
+        "published_at": datetime.utcnow().isoformat(),
+        **(metadata or {}),
+    }
+    target = manifest_path(store_name)
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, target)
+
+    logging.info(f"Published {store_name} index version {version}")
+    return final_path
+
+
+def prune_versions(store_name: str, keep: int) -> None:
+    """
+    Deletes all but the newest `keep` versions plus any abandoned staging dirs.
+    The live version is never removed.
+    """
+    root = versions_dir(store_name)
+    if not os.path.isdir(root):
+        return
+
+    manifest = read_manifest(store_name) or {}
+    live = manifest.get("version")
+
+    entries = sorted(os.listdir(root))
+    published = [e for e in entries if not e.endswith(STAGING_SUFFIX)]
+    stale = set(published[:-keep] if keep > 0 else published)
+
+    for entry in entries:
+        if entry == live:
+            continue
+        if entry in stale or entry.endswith(STAGING_SUFFIX):
+            shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
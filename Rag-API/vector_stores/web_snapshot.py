@@ -0,0 +1,185 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+
+from config import (
+    CLI_DOC_URLS,
+    WEB_FETCH_TIMEOUT,
+    WEB_FETCH_WORKERS,
+    WEB_SNAPSHOT_DIR,
+    WEB_SNAPSHOT_REFRESH,
+)
+
+USER_AGENT = os.environ.get("USER_AGENT", "Doc_search_Agent")
+
+
+class SnapshotStore:
+    """
+    Content-addressed store of fetched pages.
+    `index.json` maps each URL to the sha256 of its body plus the validators
+    (ETag / Last-Modified) needed for conditional refreshes.
+    """
+
+    def __init__(self, root: str = WEB_SNAPSHOT_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        self.lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._index = self._read_index()
+
+    def _read_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Unreadable snapshot index, starting empty: {e}")
+            return {}
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, f"{digest}.html")
+
+    def entry(self, url: str) -> Optional[Dict[str, Any]]:
+        entry = self._index.get(url)
+        if entry and os.path.exists(self._object_path(entry["sha256"])):
+            return entry
+        return None
+
+    def get(self, url: str) -> Optional[bytes]:
+        entry = self.entry(url)
+        if not entry:
+            return None
+        with open(self._object_path(entry["sha256"]), "rb") as f:
+            return f.read()
+
+    def put(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]) -> bool:
+        """
+        Stores a fetched body. Returns True if the content changed.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        now = datetime.utcnow().isoformat()
+        with self.lock:
+            previous = self._index.get(url, {})
+            self._index[url] = {
+                "sha256": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": now,
+                "checked_at": now,
+            }
+            self._write_index()
+        return previous.get("sha256") != digest
+
+    def mark_checked(self, url: str):
+        with self.lock:
+            if url in self._index:
+                self._index[url]["checked_at"] = datetime.utcnow().isoformat()
+                self._write_index()
+
+
+def _fetch_one(session: requests.Session, store: SnapshotStore, url: str) -> str:
+    headers = {}
+    entry = store.entry(url)
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = session.get(url, headers=headers, timeout=WEB_FETCH_TIMEOUT)
+        if response.status_code == 304:
+            store.mark_checked(url)
+            return "not_modified"
+        response.raise_for_status()
+    except Exception as e:
+        logging.warning(f"Failed to fetch {url}: {e}")
+        return "failed"
+
+    changed = store.put(
+        url,
+        response.content,
+        response.headers.get("ETag"),
+        response.headers.get("Last-Modified"),
+    )
+    return "updated" if changed else "unchanged"
+
+
+def refresh_snapshots(urls: Iterable[str] = CLI_DOC_URLS,
+                      store: Optional[SnapshotStore] = None) -> Dict[str, str]:
+    """
+    Conditionally re-fetches `urls` in parallel. Pages that fail keep their last snapshot.
+    """
+    store = store or SnapshotStore()
+    urls = list(urls)
+    if not urls:
+        return {}
+
+    with requests.Session() as session:
+        session.headers["User-Agent"] = USER_AGENT
+        with ThreadPoolExecutor(max_workers=min(WEB_FETCH_WORKERS, len(urls))) as pool:
+            results = pool.map(lambda u: _fetch_one(session, store, u), urls)
+            outcome = dict(zip(urls, results))
+
+    logging.info(f"Web snapshot refresh: {outcome}")
+    return outcome
+
+
+def _to_document(url: str, content: bytes) -> Document:
+    soup = BeautifulSoup(content, "html.parser")
+    metadata = {"source": url}
+    if soup.title and soup.title.string:
+        metadata["title"] = soup.title.string.strip()
+    return Document(page_content=soup.get_text(), metadata=metadata)
+
+
+def load_cli_docs(urls: Iterable[str] = CLI_DOC_URLS,
+                  refresh: bool = WEB_SNAPSHOT_REFRESH) -> List[Document]:
+    """
+    Returns the Docker CLI pages as documents, read from the snapshot store.
+    Only pages with no snapshot are fetched unless `refresh` is set.
+    """
+    store = SnapshotStore()
+    urls = list(urls)
+
+    to_fetch = urls if refresh else [u for u in urls if not store.entry(u)]
+    if to_fetch:
+        refresh_snapshots(to_fetch, store)
+
+    docs = []
+    for url in urls:
+        content = store.get(url)
+        if content is None:
+            logging.warning(f"No snapshot available for {url}; skipping.")
+            continue
+        docs.append(_to_document(url, content))
+    return docs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    refresh_snapshots()
@@ -1,46 +1,20 @@
 # Note: Agno is a hypothetical framework - implementing a pattern-based approach
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
-import re
+from llm_clients import get_openai_client
+from config import AGNO_PATTERNS_FILE
+from pattern_matcher import PatternMatcher
 
 class AgnoDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
-        # Define Agno-style patterns
-        self.patterns = {
-            "list_containers": {
-                "triggers": ["list containers", "show containers", "running containers", "ps"],
-                "command": "docker ps",
-                "safe": True
-            },
-            "list_images": {
-                "triggers": ["list images", "show images", "docker images"],
-                "command": "docker images",
-                "safe": True
-            },
-            "docker_version": {
-                "triggers": ["version", "docker version"],
-                "command": "docker version",
-                "safe": True
-            },
-            "docker_info": {
-                "triggers": ["info", "system info", "docker info"],
-                "command": "docker info",
-                "safe": True
-            }
-        }
+        # Agno-style patterns, compiled once into a single automaton
+        self.matcher = PatternMatcher.from_file(AGNO_PATTERNS_FILE)
     
     def _match_pattern(self, query: str):
         """Match query against predefined patterns"""
-        query_lower = query.lower()
-        for pattern_name, pattern_data in self.patterns.items():
-            for trigger in pattern_data["triggers"]:
-                if trigger in query_lower:
-                    return pattern_data
-        return None
+        return self.matcher.match(query)
     
     def run(self, query: str) -> str:
         try:
@@ -0,0 +1,94 @@
+"""
+Benchmark: compiled Aho-Corasick matcher vs. the linear trigger scan.
+
+Loads the shipped Agno patterns plus synthetic intents up to each pattern
+count and times matching a fixed set of queries. The automaton's cost
+follows the query length; the linear scan grows with every trigger added.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pattern_matcher --iterations 200
+"""
+import argparse
+import json
+import random
+import time
+
+from pattern_matcher import PatternMatcher
+
+PATTERNS_FILE = "agno_patterns.json"
+
+QUERIES = [
+    "show me all running containers",
+    "which docker version is installed on this host",
+    "list images that are taking up disk usage",
+    "how do I write a multi-stage Dockerfile for a python service",
+    "please remove unused images and clean up",
+    "what does the compose file for my web app look like",
+]
+
+VOCABULARY = [
+    "container", "image", "volume", "network", "service", "stack", "node", "secret",
+    "config", "plugin", "context", "builder", "swarm", "registry", "tag", "label",
+    "port", "mount", "healthcheck", "restart", "policy", "limit", "cpu", "memory",
+]
+VERBS = ["list", "show", "inspect", "describe", "count", "find", "check", "watch"]
+
+
+def linear_match(patterns, query: str):
+    """The scan the Agno agent used before the matcher"""
+    query_lower = query.lower()
+    for pattern in patterns:
+        for trigger in pattern["triggers"]:
+            if trigger in query_lower:
+                return pattern
+    return None
+
+
+def synthetic_patterns(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    patterns = []
+    for i in range(count):
+        noun = rng.choice(VOCABULARY)
+        patterns.append({
+            "name": f"intent_{i}",
+            "triggers": [f"{rng.choice(VERBS)} {noun} {i}", f"{noun} {rng.choice(VERBS)} {i}"],
+            "command": f"docker {noun} ls",
+            "safe": True,
+        })
+    return patterns
+
+
+def _time_per_query(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (iterations * len(QUERIES)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(PATTERNS_FILE, encoding="utf-8") as f:
+        shipped = json.load(f)["patterns"]
+
+    print(f"{args.iterations} iterations x {len(QUERIES)} queries\n")
+    print(f"{'patterns':>9}{'triggers':>10}{'build':>10}{'automaton':>12}{'linear':>12}")
+    for count in (len(shipped), 100, 1000, 10000):
+        patterns = shipped + synthetic_patterns(count - len(shipped))
+        triggers = sum(len(pattern["triggers"]) for pattern in patterns)
+
+        start = time.perf_counter()
+        matcher = PatternMatcher(patterns)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        automaton = _time_per_query(matcher.match, args.iterations)
+        linear = _time_per_query(lambda query: linear_match(patterns, query), args.iterations)
+        print(f"{len(patterns):>9}{triggers:>10}{build_ms:>8.1f}ms{automaton:>10.1f}us{linear:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
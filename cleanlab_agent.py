@@ -1,84 +1,132 @@
 # Note: Cleanlab is primarily for data quality - simulating confidence scoring approach
-from openai import OpenAI
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
 import numpy as np
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_openai_client
+from config import CLEANLAB_NUM_CANDIDATES, CLEANLAB_MAX_CONCURRENT_RUNS
+
+# Shared by every agent instance; a run's abandoned candidates only hold
+# workers set aside for that run, not the slots of the next one
+_executor = ThreadPoolExecutor(
+    max_workers=CLEANLAB_MAX_CONCURRENT_RUNS * CLEANLAB_NUM_CANDIDATES,
+    thread_name_prefix="cleanlab"
+)
 
 class CleanlabDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
         # Simulate confidence thresholds
         self.confidence_threshold = 0.8
         self.safe_commands = ["docker ps", "docker images", "docker version", "docker info"]
+        self.docker_terms = ["docker", "container", "image", "dockerfile", "compose"]
+        self.confidence_weights = np.array([0.2, 0.3, 0.3, 0.2])
+        
+        # Candidates are generated concurrently; with early_exit the first one
+        # over the threshold wins. use_n_parameter asks for all of them in a
+        # single request instead, for providers that support `n`.
+        self.num_candidates = CLEANLAB_NUM_CANDIDATES
+        self.early_exit = True
+        self.use_n_parameter = False
     
-    def _calculate_confidence(self, query: str, response: str) -> float:
-        """Simulate confidence calculation based on response quality"""
-        confidence_factors = []
+    def _calculate_confidences(self, query: str, responses: List[str]) -> np.ndarray:
+        """Simulate confidence calculation based on response quality, for all candidates at once"""
+        lowered = [response.lower() for response in responses]
+        lengths = np.array([len(response) for response in responses], dtype=float)
         
         # Factor 1: Response length (reasonable responses are neither too short nor too long)
-        length_score = min(len(response) / 500, 1.0) if len(response) > 50 else 0.3
-        confidence_factors.append(length_score)
+        length_scores = np.where(lengths > 50, np.minimum(lengths / 500, 1.0), 0.3)
         
         # Factor 2: Contains Docker-specific terms
-        docker_terms = ["docker", "container", "image", "dockerfile", "compose"]
-        docker_score = sum(1 for term in docker_terms if term.lower() in response.lower()) / len(docker_terms)
-        confidence_factors.append(docker_score)
+        docker_scores = np.array([[term in text for term in self.docker_terms] for text in lowered]).mean(axis=1)
         
         # Factor 3: Query-response relevance (simple keyword matching)
         query_words = set(query.lower().split())
-        response_words = set(response.lower().split())
-        relevance_score = len(query_words.intersection(response_words)) / max(len(query_words), 1)
-        confidence_factors.append(relevance_score)
+        relevance_scores = np.array([
+            len(query_words.intersection(text.split())) for text in lowered
+        ]) / max(len(query_words), 1)
         
         # Factor 4: Command safety
-        safety_score = 1.0 if any(safe_cmd in response.lower() for safe_cmd in self.safe_commands) else 0.7
-        confidence_factors.append(safety_score)
+        safety_scores = np.where([any(cmd in text for cmd in self.safe_commands) for text in lowered], 1.0, 0.7)
+        
+        # Weighted average per candidate
+        factors = np.column_stack([length_scores, docker_scores, relevance_scores, safety_scores])
+        return np.minimum(factors @ self.confidence_weights, 1.0)
+    
+    def _calculate_confidence(self, query: str, response: str) -> float:
+        """Simulate confidence calculation based on response quality"""
+        return float(self._calculate_confidences(query, [response])[0])
+    
+    def _messages(self, docs: str, query: str, iteration: int) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": f"""You are a Docker expert assistant (iteration {iteration}).
+                Use the documentation context to provide accurate Docker guidance.
+                Be specific and practical in your responses."""
+            },
+            {
+                "role": "user",
+                "content": f"Documentation: {docs}\n\nQuery: {query}"
+            }
+        ]
+    
+    def _generate(self, docs: str, query: str, i: int, done: threading.Event = None) -> str:
+        if done is not None and done.is_set():
+            # Another candidate already won; don't spend a request on this one
+            return ""
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=self._messages(docs, query, i + 1),
+            temperature=0.1 + (i * 0.1)  # Slight variation
+        )
+        return response.choices[0].message.content
+    
+    def _generate_candidates(self, docs: str, query: str) -> Tuple[List[str], np.ndarray]:
+        """All candidates with their confidences; stops early once one is good enough"""
+        if self.use_n_parameter:
+            # One request, n samples at the middle temperature
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=self._messages(docs, query, 1),
+                temperature=0.2,
+                n=self.num_candidates
+            )
+            responses = [choice.message.content for choice in response.choices]
+            return responses, self._calculate_confidences(query, responses)
         
-        # Calculate weighted average
-        weights = [0.2, 0.3, 0.3, 0.2]
-        confidence = sum(w * f for w, f in zip(weights, confidence_factors))
+        done = threading.Event()
+        futures = [_executor.submit(self._generate, docs, query, i, done) for i in range(self.num_candidates)]
+        if not self.early_exit:
+            responses = [future.result() for future in futures]
+            return responses, self._calculate_confidences(query, responses)
         
-        return min(confidence, 1.0)
+        responses, confidences = [], []
+        for future in as_completed(futures):
+            answer = future.result()
+            responses.append(answer)
+            confidences.append(self._calculate_confidence(query, answer))
+            if confidences[-1] >= self.confidence_threshold:
+                # Queued candidates are dropped; ones already in flight finish unread
+                done.set()
+                for pending in futures:
+                    pending.cancel()
+                break
+        return responses, np.array(confidences)
     
     def run(self, query: str) -> str:
         try:
             # Get documentation context
             docs = doc_qa_tool(query, None)
             
-            # Generate multiple responses for confidence estimation
-            responses = []
-            confidences = []
-            
-            for i in range(3):  # Generate 3 responses
-                messages = [
-                    {
-                        "role": "system",
-                        "content": f"""You are a Docker expert assistant (iteration {i+1}).
-                        Use the documentation context to provide accurate Docker guidance.
-                        Be specific and practical in your responses."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Documentation: {docs}\n\nQuery: {query}"
-                    }
-                ]
-                
-                response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=messages,
-                    temperature=0.1 + (i * 0.1)  # Slight variation
-                )
-                
-                answer = response.choices[0].message.content
-                confidence = self._calculate_confidence(query, answer)
-                
-                responses.append(answer)
-                confidences.append(confidence)
+            # Generate candidates concurrently for confidence estimation
+            responses, confidences = self._generate_candidates(docs, query)
             
             # Select highest confidence response
-            best_idx = np.argmax(confidences)
+            best_idx = int(np.argmax(confidences))
             best_response = responses[best_idx]
             best_confidence = confidences[best_idx]
             
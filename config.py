@@ -11,14 +11,53 @@ AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USERNAME = os.getenv("NEO4J_USERNAME", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
+NEO4J_SESSION_POOL_SIZE = 8
+NEO4J_LOOKUP_CACHE_SIZE = 256
 
 # Directories
 DATA_DIR = "data"
 FAISS_INDEX_DIR = "vector_data/faiss_index"
 
+# Mem0 memory writes are batched in the background; searches are cached briefly
+MEM0_WRITE_BATCH_SIZE = 16
+MEM0_WRITE_FLUSH_SECONDS = 2.0
+MEM0_WRITE_QUEUE_SIZE = 1000
+MEM0_SEARCH_CACHE_TTL = 30
+
+# Trigger patterns the Agno agent answers without calling the LLM
+AGNO_PATTERNS_FILE = "agno_patterns.json"
+
+# Graphlit knowledge lookup: serialized inverted index and entries returned per query
+KNOWLEDGE_INDEX_PATH = "vector_data/graphlit_knowledge_index.json"
+KNOWLEDGE_INDEX_TOP_K = 5
+
 # Embeddings
 embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
 
 # Model configurations
 DEFAULT_MODEL = "gpt-4o-mini"
 DEFAULT_TEMPERATURE = 0.1
+
+# Connection pool shared by every LLM client (see llm_clients.py)
+LLM_HTTP_MAX_CONNECTIONS = 100
+LLM_HTTP_MAX_KEEPALIVE = 20
+LLM_HTTP_KEEPALIVE_EXPIRY = 30
+LLM_HTTP_CONNECT_TIMEOUT = 5
+LLM_HTTP_READ_TIMEOUT = 120
+
+# Tool calls from one assistant turn run concurrently; seconds allowed per tool
+TOOL_CALL_MAX_WORKERS = 8
+TOOL_CALL_DEFAULT_TIMEOUT = 30
+TOOL_CALL_TIMEOUTS = {
+    "docker_docs_search": 30,
+    "execute_docker_command": 60
+}
+# Tools that run a Docker command, and the argument holding it; state-changing
+# commands run one at a time in the model's order instead of concurrently
+TOOL_CALL_COMMAND_ARGUMENTS = {
+    "execute_docker_command": "command"
+}
+
+# Cleanlab candidate generation: one shared pool sized for concurrent runs x candidates
+CLEANLAB_NUM_CANDIDATES = 3
+CLEANLAB_MAX_CONCURRENT_RUNS = 8
@@ -1,13 +1,12 @@
 from crewai import Agent, Task, Crew
 from crewai.tools import tool
-from langchain_openai import ChatOpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_langchain_chat_model
 
 class CrewAIDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.llm = ChatOpenAI(api_key=OPENAI_API_KEY, model="gpt-4o-mini")
+        self.llm = get_langchain_chat_model("gpt-4o-mini")
         
         @tool
         def docker_docs_search(query: str) -> str:
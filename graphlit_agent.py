@@ -1,13 +1,14 @@
 # Note: Graphlit is for unstructured data processing - simulating document processing approach
 import json
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_openai_client
+from config import KNOWLEDGE_INDEX_PATH, KNOWLEDGE_INDEX_TOP_K
+from knowledge_index import KnowledgeIndex
 
 class GraphlitDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
         # Simulate Graphlit document processing
         self.processed_docs = {
@@ -24,22 +25,17 @@ class GraphlitDockerAgent(BaseDockerAgent):
                 "compose": "A tool for defining and running multi-container Docker applications"
             }
         }
+        self.section_labels = {"docker_commands": "Command", "docker_concepts": "Concept"}
+        
+        # Prebuilt term -> entry index, reloaded from disk while the docs are unchanged
+        self.knowledge_index = KnowledgeIndex.load_or_build(KNOWLEDGE_INDEX_PATH, self.processed_docs)
     
     def _process_query_with_graphlit(self, query: str):
         """Simulate Graphlit's document processing and knowledge extraction"""
-        query_lower = query.lower()
         relevant_info = []
-        
-        # Extract relevant command information
-        for cmd, description in self.processed_docs["docker_commands"].items():
-            if cmd in query_lower or any(word in query_lower for word in description.lower().split()):
-                relevant_info.append(f"Command '{cmd}': {description}")
-        
-        # Extract relevant concept information
-        for concept, description in self.processed_docs["docker_concepts"].items():
-            if concept in query_lower:
-                relevant_info.append(f"Concept '{concept}': {description}")
-        
+        for entry, _ in self.knowledge_index.search(query, top_k=KNOWLEDGE_INDEX_TOP_K):
+            label = self.section_labels.get(entry["section"], entry["section"])
+            relevant_info.append(f"{label} '{entry['name']}': {entry['text']}")
         return relevant_info
     
     def run(self, query: str) -> str:
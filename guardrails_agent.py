@@ -1,13 +1,12 @@
 import guardrails as gd
 from guardrails.validators import ValidLength, ToxicLanguage
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_openai_client
 
 class GuardrailsDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
         # Define guardrails spec
         self.rail_spec = """
@@ -0,0 +1,129 @@
+"""
+Knowledge index - Inverted index with TF-IDF scoring over processed documentation entries
+
+Each entry is a named piece of text (a command or concept and its
+description). Terms are lowercased, stripped of stopwords and plural "s",
+and mapped to the entries that contain them, so a lookup only touches the
+postings of the query's own terms. The index is saved as JSON together with
+a fingerprint of its source, and rebuilt only when the source changes.
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Tuple
+
+STOPWORDS = frozenset("""
+a about all an and any are as at be been but by can could do does for from get
+had has have how i if in into is it its like me my of on or our show so that the
+their them then there these this those to use used using was what when where which
+while who why will with you your
+""".split())
+
+# An entry's own name counts as much as this many occurrences in its text
+NAME_WEIGHT = 3
+
+# Entries scoring below this fraction of the best match are left out
+MIN_RELATIVE_SCORE = 0.2
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercased terms without stopwords; plurals folded onto the singular"""
+    terms = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class KnowledgeIndex:
+    """Term -> entry postings with precomputed TF-IDF weights"""
+
+    def __init__(self, entries: List[Dict[str, str]], postings: Dict[str, List[Tuple[int, float]]],
+                 fingerprint: str = ""):
+        self.entries = entries
+        self.postings = postings
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, entries: List[Dict[str, str]], fingerprint: str = "") -> 'KnowledgeIndex':
+        """Index entries of the form {'section', 'name', 'text'}"""
+        counts = []
+        document_frequency: Counter = Counter()
+        for entry in entries:
+            terms = Counter(normalize(entry["text"]))
+            for term in normalize(entry["name"]):
+                terms[term] += NAME_WEIGHT
+            counts.append(terms)
+            document_frequency.update(terms.keys())
+
+        total = len(entries)
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for entry_id, terms in enumerate(counts):
+            length = sum(terms.values()) or 1
+            for term, count in terms.items():
+                idf = math.log(1 + total / document_frequency[term])
+                postings[term].append((entry_id, count / length * idf))
+        return cls(entries, dict(postings), fingerprint)
+
+    @classmethod
+    def from_processed_docs(cls, processed_docs: Dict[str, Dict[str, str]]) -> 'KnowledgeIndex':
+        entries = [
+            {"section": section, "name": name, "text": text}
+            for section, items in processed_docs.items()
+            for name, text in items.items()
+        ]
+        return cls.build(entries, fingerprint_of(processed_docs))
+
+    @classmethod
+    def load_or_build(cls, path: str, processed_docs: Dict[str, Dict[str, str]]) -> 'KnowledgeIndex':
+        """Load the saved index if it was built from the same docs, otherwise rebuild and save it"""
+        fingerprint = fingerprint_of(processed_docs)
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if index.fingerprint == fingerprint:
+                    return index
+            except (OSError, ValueError, KeyError):
+                pass
+        index = cls.from_processed_docs(processed_docs)
+        index.save(path)
+        return index
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "entries": self.entries, "postings": self.postings}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'KnowledgeIndex':
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        postings = {term: [tuple(posting) for posting in entries] for term, entries in data["postings"].items()}
+        return cls(data["entries"], postings, data["fingerprint"])
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[Dict[str, str], float]]:
+        """Best-scoring entries for `query`, highest first"""
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(normalize(query)):
+            for entry_id, weight in self.postings.get(term, ()):
+                scores[entry_id] += weight
+        ranked = heapq.nsmallest(top_k, scores.items(), key=lambda item: (-item[1], item[0]))
+        cutoff = ranked[0][1] * MIN_RELATIVE_SCORE if ranked else 0.0
+        return [(self.entries[entry_id], score) for entry_id, score in ranked if score >= cutoff]
+
+
+def fingerprint_of(processed_docs: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(processed_docs, sort_keys=True).encode("utf-8")).hexdigest()
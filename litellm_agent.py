@@ -1,13 +1,16 @@
 import litellm
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
+from tool_dispatch import dispatch_tool_calls
+from llm_clients import get_http_client
 from config import OPENAI_API_KEY
-import json
 
 class LiteLLMDockerAgent(BaseDockerAgent):
     def setup(self):
         # Configure LiteLLM
         litellm.api_key = OPENAI_API_KEY
+        # Reuse the process-wide connection pool instead of LiteLLM's own
+        litellm.client_session = get_http_client()
         self.model = "gpt-4o-mini"
         
         self.tools = [
@@ -40,6 +43,11 @@ class LiteLLMDockerAgent(BaseDockerAgent):
                 }
             }
         ]
+        
+        self.tool_handlers = {
+            "docker_docs_search": lambda args: doc_qa_tool(args["query"], None),
+            "execute_docker_command": lambda args: run_command_tool(args["command"])
+        }
     
     def run(self, query: str) -> str:
         try:
@@ -64,23 +72,8 @@ class LiteLLMDockerAgent(BaseDockerAgent):
                 # Handle tool calls
                 messages.append(message)
                 
-                for tool_call in message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    if function_name == "docker_docs_search":
-                        result = doc_qa_tool(function_args["query"], None)
-                    elif function_name == "execute_docker_command":
-                        result = run_command_tool(function_args["command"])
-                    else:
-                        result = "Unknown function"
-                    
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": result
-                    })
+                # Independent calls run concurrently; results keep the model's order
+                messages.extend(dispatch_tool_calls(message.tool_calls, self.tool_handlers))
                 
                 # Get final response
                 final_response = litellm.completion(
@@ -1,13 +1,12 @@
 from llama_index.core.agent import ReActAgent
-from llama_index.llms.openai import OpenAI
 from llama_index.core.tools import FunctionTool
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_llama_index_llm
 
 class LlamaIndexDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.llm = OpenAI(api_key=OPENAI_API_KEY, model="gpt-4o-mini")
+        self.llm = get_llama_index_llm("gpt-4o-mini")
         
         # Create tools
         def docker_docs_search(query: str) -> str:
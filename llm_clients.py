@@ -0,0 +1,83 @@
+"""
+LLM clients - Shared client instances over one pooled HTTP connection pool
+
+Agents ask for a client instead of constructing their own, so every agent
+in the process reuses the same keep-alive connections (HTTP/2 when the h2
+package is installed) and pays for TLS handshakes once.
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from config import (OPENAI_API_KEY, LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE,
+                    LLM_HTTP_KEEPALIVE_EXPIRY, LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_READ_TIMEOUT)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_http_client: Optional[httpx.Client] = None
+_clients: Dict[Tuple[Any, ...], Any] = {}
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """The process-wide pooled HTTP client"""
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(LLM_HTTP_READ_TIMEOUT, connect=LLM_HTTP_CONNECT_TIMEOUT)
+            )
+        return _http_client
+
+
+def _shared(key: Tuple[Any, ...], factory):
+    with _lock:
+        client = _clients.get(key)
+    if client is not None:
+        return client
+    client = factory()
+    with _lock:
+        # Another thread may have built the same client meanwhile; keep the first
+        return _clients.setdefault(key, client)
+
+
+def get_openai_client(api_key: Optional[str] = None, base_url: Optional[str] = None):
+    """Shared openai.OpenAI client; it is thread-safe and not tied to a model"""
+    from openai import OpenAI
+
+    api_key = api_key or OPENAI_API_KEY
+    return _shared(
+        ("openai", api_key, base_url),
+        lambda: OpenAI(api_key=api_key, base_url=base_url, http_client=get_http_client())
+    )
+
+
+def get_langchain_chat_model(model: str, **params):
+    """Shared LangChain ChatOpenAI for a model and its parameters"""
+    from langchain_openai import ChatOpenAI
+
+    return _shared(
+        ("langchain_openai", model, tuple(sorted(params.items()))),
+        lambda: ChatOpenAI(api_key=OPENAI_API_KEY, model=model, http_client=get_http_client(), **params)
+    )
+
+
+def get_llama_index_llm(model: str, **params):
+    """Shared LlamaIndex OpenAI LLM for a model and its parameters"""
+    from llama_index.llms.openai import OpenAI
+
+    return _shared(
+        ("llama_index_openai", model, tuple(sorted(params.items()))),
+        lambda: OpenAI(api_key=OPENAI_API_KEY, model=model, http_client=get_http_client(), **params)
+    )
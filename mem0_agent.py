@@ -1,12 +1,14 @@
 from mem0 import Memory
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_openai_client
+from config import (OPENAI_API_KEY, MEM0_WRITE_BATCH_SIZE, MEM0_WRITE_FLUSH_SECONDS,
+                    MEM0_WRITE_QUEUE_SIZE, MEM0_SEARCH_CACHE_TTL)
+from mem0_memory import BackgroundMemoryWriter, MemorySearchCache
 
 class Mem0DockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
         # Initialize Mem0
         config = {
@@ -20,11 +22,28 @@ class Mem0DockerAgent(BaseDockerAgent):
         }
         self.memory = Memory.from_config(config)
         self.user_id = "docker_user"
+        
+        # Memory ingestion happens in the background, never before the answer is returned
+        self.search_cache = MemorySearchCache(ttl=MEM0_SEARCH_CACHE_TTL)
+        self.memory_writer = BackgroundMemoryWriter(
+            self.memory,
+            batch_size=MEM0_WRITE_BATCH_SIZE,
+            flush_interval=MEM0_WRITE_FLUSH_SECONDS,
+            max_queue=MEM0_WRITE_QUEUE_SIZE,
+            search_cache=self.search_cache
+        )
+    
+    def _search_memories(self, query: str):
+        memories = self.search_cache.get(self.user_id, query)
+        if memories is None:
+            memories = self.memory.search(query, user_id=self.user_id)
+            self.search_cache.set(self.user_id, query, memories)
+        return memories
     
     def run(self, query: str) -> str:
         try:
             # Get relevant memories
-            memories = self.memory.search(query, user_id=self.user_id)
+            memories = self._search_memories(query)
             memory_context = "\n".join([mem["memory"] for mem in memories]) if memories else ""
             
             # Get documentation context
@@ -64,7 +83,7 @@ Docker documentation: {docs}
             answer = response.choices[0].message.content
             
             # Store interaction in memory
-            self.memory.add(f"User asked: {query}. Response: {answer}", user_id=self.user_id)
+            self.memory_writer.submit(f"User asked: {query}. Response: {answer}", user_id=self.user_id)
             
             # Execute safe commands if mentioned
             if "docker " in answer.lower():
@@ -79,7 +98,7 @@ Docker documentation: {docs}
                         answer += f"\n\nExecution Result:\n{execution_result}"
                         
                         # Store execution result in memory
-                        self.memory.add(f"Executed command: {cmd}. Result: {execution_result}", user_id=self.user_id)
+                        self.memory_writer.submit(f"Executed command: {cmd}. Result: {execution_result}", user_id=self.user_id)
                         break
             
             return answer
@@ -0,0 +1,134 @@
+"""
+Mem0 memory - Background batched writes and a short-lived search cache
+
+Memory.add runs LLM extraction and embedding, so it is kept off the
+response path: interactions are queued, deduplicated and written by a
+daemon thread in per-user batches (one add call, and so one extraction,
+per user per batch). Searches are cached for a few seconds and a user's
+entries are dropped as soon as new memories for them have been written.
+"""
+import atexit
+import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# How many written interactions are remembered to suppress repeats
+RECENT_WRITES = 1024
+
+
+def _digest(user_id: str, text: str) -> str:
+    return hashlib.sha1(f"{user_id}\0{' '.join(text.split())}".encode("utf-8")).hexdigest()
+
+
+class MemorySearchCache:
+    """TTL cache of memory.search results per user and query"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, query: str) -> Optional[Any]:
+        key = (user_id, " ".join(query.lower().split()))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+            self._entries.pop(key, None)
+            return None
+
+    def set(self, user_id: str, query: str, results: Any):
+        key = (user_id, " ".join(query.lower().split()))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, results)
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+
+class BackgroundMemoryWriter:
+    """Queues memory.add calls and writes them in deduplicated per-user batches"""
+
+    def __init__(self, memory, batch_size: int, flush_interval: float, max_queue: int,
+                 search_cache: Optional[MemorySearchCache] = None):
+        self.memory = memory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.search_cache = search_cache
+        self._queue: "queue.Queue[Tuple[str, str]]" = queue.Queue(maxsize=max_queue)
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name="mem0-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, text: str, user_id: str) -> bool:
+        """Queue an interaction without blocking; False if the queue is full and it was dropped"""
+        try:
+            self._queue.put_nowait((user_id, text))
+            return True
+        except queue.Full:
+            logger.warning("Memory write queue full, dropping interaction for %s", user_id)
+            return False
+
+    def _next_batch(self) -> List[Tuple[str, str]]:
+        """Block for the first item, then gather more until the batch is full or the interval ends"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Tuple[str, str]]):
+        by_user: Dict[str, List[str]] = defaultdict(list)
+        for user_id, text in batch:
+            digest = _digest(user_id, text)
+            if digest in self._recent:
+                continue
+            self._recent[digest] = None
+            while len(self._recent) > RECENT_WRITES:
+                self._recent.popitem(last=False)
+            by_user[user_id].append(text)
+
+        for user_id, texts in by_user.items():
+            try:
+                self.memory.add([{"role": "user", "content": text} for text in texts], user_id=user_id)
+            except Exception:
+                logger.exception("Memory write of %d interactions failed for %s", len(texts), user_id)
+                continue
+            if self.search_cache:
+                self.search_cache.invalidate_user(user_id)
+
+    def _worker(self):
+        while not (self._stopped.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self):
+        """Block until everything queued so far has been written"""
+        self._queue.join()
+
+    def close(self, timeout: float = 10.0):
+        """Write what is still queued and stop the worker"""
+        self._stopped.set()
+        self._thread.join(timeout)
@@ -1,65 +1,32 @@
-from neo4j import GraphDatabase
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY
+from llm_clients import get_openai_client
+from config import (NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD,
+                    NEO4J_SESSION_POOL_SIZE, NEO4J_LOOKUP_CACHE_SIZE)
+from neo4j_graph import DockerKnowledgeGraph, get_driver
 
 class Neo4jDockerAgent(BaseDockerAgent):
     def setup(self):
-        # Initialize Neo4j driver
+        # Shared driver; the graph is seeded once per database, not per agent
         try:
-            self.driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
-            self._create_docker_knowledge_graph()
+            self.graph = DockerKnowledgeGraph(
+                get_driver(NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD),
+                pool_size=NEO4J_SESSION_POOL_SIZE,
+                cache_size=NEO4J_LOOKUP_CACHE_SIZE
+            )
+            self.graph.ensure_schema()
         except Exception as e:
             print(f"Neo4j connection failed: {e}")
-            self.driver = None
+            self.graph = None
         
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
-    
-    def _create_docker_knowledge_graph(self):
-        """Create a basic Docker knowledge graph"""
-        with self.driver.session() as session:
-            # Create Docker command nodes and relationships
-            session.run("""
-                MERGE (docker:Tool {name: 'Docker'})
-                MERGE (ps:Command {name: 'ps', description: 'List containers', safe: true})
-                MERGE (images:Command {name: 'images', description: 'List images', safe: true})
-                MERGE (run:Command {name: 'run', description: 'Create and start container', safe: false})
-                MERGE (stop:Command {name: 'stop', description: 'Stop container', safe: false})
-                MERGE (rm:Command {name: 'rm', description: 'Remove container', safe: false})
-                
-                MERGE (docker)-[:HAS_COMMAND]->(ps)
-                MERGE (docker)-[:HAS_COMMAND]->(images)
-                MERGE (docker)-[:HAS_COMMAND]->(run)
-                MERGE (docker)-[:HAS_COMMAND]->(stop)
-                MERGE (docker)-[:HAS_COMMAND]->(rm)
-                
-                MERGE (list:Intent {name: 'list'})
-                MERGE (create:Intent {name: 'create'})
-                MERGE (manage:Intent {name: 'manage'})
-                
-                MERGE (list)-[:USES_COMMAND]->(ps)
-                MERGE (list)-[:USES_COMMAND]->(images)
-                MERGE (create)-[:USES_COMMAND]->(run)
-                MERGE (manage)-[:USES_COMMAND]->(stop)
-                MERGE (manage)-[:USES_COMMAND]->(rm)
-            """)
+        self.client = get_openai_client()
     
     def _query_graph(self, intent: str):
         """Query the knowledge graph for relevant commands"""
-        if not self.driver:
+        if not self.graph:
             return []
         
-        with self.driver.session() as session:
-            result = session.run("""
-                MATCH (i:Intent)-[:USES_COMMAND]->(c:Command)
-                WHERE i.name CONTAINS $intent OR c.description CONTAINS $intent
-                RETURN c.name as command, c.description as description, c.safe as safe
-            """, intent=intent.lower())
-            
-            return [{"command": record["command"], 
-                    "description": record["description"], 
-                    "safe": record["safe"]} for record in result]
+        return self.graph.find_commands(intent)
     
     def run(self, query: str) -> str:
         try:
@@ -116,5 +83,6 @@ Documentation Context:
             return f"Neo4j Graph RAG Error: {str(e)}"
     
     def __del__(self):
-        if hasattr(self, 'driver') and self.driver:
-            self.driver.close()
+        # The driver is shared and closed at exit; only release this agent's sessions
+        if getattr(self, 'graph', None):
+            self.graph.close()
@@ -0,0 +1,210 @@
+"""
+Neo4j knowledge graph - Versioned one-time seeding, indexed lookups and pooled sessions
+
+Seeding and index creation run once per database: a SchemaMarker node
+records the version that was applied, and later agents skip straight to
+querying. Lookups match intents by exact name through a lookup index and
+command descriptions through a full-text index, over sessions borrowed
+from a small pool, and repeated lookups are answered from an in-process
+LRU cache keyed by the known terms the query contains.
+
+DockerKnowledgeGraph only needs an object with a `session()` method, so a
+local Neo4j container or an in-process stand-in can be passed instead of a
+driver from get_driver().
+"""
+import atexit
+import queue
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from knowledge_index import STOPWORDS
+
+SCHEMA_NAME = "docker_knowledge_graph"
+SCHEMA_VERSION = 1
+
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT schema_marker_name IF NOT EXISTS FOR (m:SchemaMarker) REQUIRE m.name IS UNIQUE",
+    "CREATE INDEX intent_name IF NOT EXISTS FOR (i:Intent) ON (i.name)",
+    "CREATE INDEX command_name IF NOT EXISTS FOR (c:Command) ON (c.name)",
+    "CREATE FULLTEXT INDEX command_description IF NOT EXISTS FOR (c:Command) ON EACH [c.description]",
+]
+
+COMMANDS = [
+    {"name": "ps", "description": "List containers", "safe": True},
+    {"name": "images", "description": "List images", "safe": True},
+    {"name": "run", "description": "Create and start container", "safe": False},
+    {"name": "stop", "description": "Stop container", "safe": False},
+    {"name": "rm", "description": "Remove container", "safe": False},
+]
+
+INTENTS = {
+    "list": ["ps", "images"],
+    "create": ["run"],
+    "manage": ["stop", "rm"],
+}
+
+SEED_QUERY = """
+    MERGE (docker:Tool {name: 'Docker'})
+    WITH docker
+    UNWIND $commands AS command
+    MERGE (c:Command {name: command.name})
+    SET c.description = command.description, c.safe = command.safe
+    MERGE (docker)-[:HAS_COMMAND]->(c)
+    WITH count(*) AS seeded
+    UNWIND $intents AS intent
+    MERGE (i:Intent {name: intent.name})
+    WITH i, intent
+    UNWIND intent.commands AS command_name
+    MATCH (c:Command {name: command_name})
+    MERGE (i)-[:USES_COMMAND]->(c)
+"""
+
+LOOKUP_QUERY = """
+    CALL {
+        MATCH (i:Intent)-[:USES_COMMAND]->(c:Command)
+        WHERE i.name IN $terms
+        RETURN c, 2.0 AS score
+        UNION
+        CALL db.index.fulltext.queryNodes('command_description', $text) YIELD node AS c, score
+        RETURN c, score
+    }
+    RETURN c.name AS command, c.description AS description, c.safe AS safe, max(score) AS score
+    ORDER BY score DESC
+    LIMIT $limit
+"""
+
+_drivers: Dict[Tuple[str, str], Any] = {}
+_drivers_lock = threading.Lock()
+
+
+def get_driver(uri: str, username: str, password: Optional[str]):
+    """One driver (and so one connection pool) per database for the whole process"""
+    from neo4j import GraphDatabase
+
+    key = (uri, username)
+    with _drivers_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = _drivers[key] = GraphDatabase.driver(uri, auth=(username, password))
+            atexit.register(driver.close)
+        return driver
+
+
+def query_terms(query: str) -> List[str]:
+    """Lowercased query words without stopwords, in order"""
+    return [word for word in re.findall(r"[a-z0-9]+", query.lower()) if word not in STOPWORDS]
+
+
+# Every word the lookup can match: intent names, command names and description words
+VOCABULARY = frozenset(
+    list(INTENTS)
+    + [command["name"] for command in COMMANDS]
+    + [word for command in COMMANDS for word in query_terms(command["description"])]
+)
+
+
+def lookup_terms(query: str) -> Tuple[str, ...]:
+    """The sorted set of query words the graph knows; different phrasings of one intent agree"""
+    return tuple(sorted({term for term in query_terms(query) if term in VOCABULARY}))
+
+
+class SessionPool:
+    """Reuses driver sessions across lookups instead of opening one per query"""
+
+    def __init__(self, driver, size: int):
+        self.driver = driver
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def session(self):
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            session = self.driver.session()
+        try:
+            yield session
+        except Exception:
+            # The session may be mid-transaction or broken; don't hand it out again
+            session.close()
+            raise
+        try:
+            self._idle.put_nowait(session)
+        except queue.Full:
+            session.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class DockerKnowledgeGraph:
+    """Intent -> command lookups over the seeded Docker graph"""
+
+    def __init__(self, driver, pool_size: int = 8, cache_size: int = 256, limit: int = 10):
+        self.driver = driver
+        self.pool = SessionPool(driver, pool_size)
+        self.cache_size = cache_size
+        self.limit = limit
+        self._cache: "OrderedDict[Tuple[str, ...], List[Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def ensure_schema(self) -> bool:
+        """Create indexes and seed the graph unless this version is already applied; True if it ran"""
+        with self.pool.session() as session:
+            record = session.run(
+                "MATCH (m:SchemaMarker {name: $name}) RETURN m.version AS version", name=SCHEMA_NAME
+            ).single()
+            if record and record["version"] is not None and record["version"] >= SCHEMA_VERSION:
+                return False
+
+            # Schema changes can't share a transaction with writes
+            for statement in SCHEMA_STATEMENTS:
+                session.run(statement).consume()
+            session.run(SEED_QUERY, commands=COMMANDS, intents=[
+                {"name": name, "commands": commands} for name, commands in INTENTS.items()
+            ]).consume()
+            session.run(
+                "MERGE (m:SchemaMarker {name: $name}) SET m.version = $version",
+                name=SCHEMA_NAME, version=SCHEMA_VERSION
+            ).consume()
+
+        self.clear_cache()
+        return True
+
+    def find_commands(self, query: str) -> List[Dict[str, Any]]:
+        """Commands whose intent is named in `query` or whose description matches it"""
+        # Words outside the vocabulary can't match, so they are neither sent nor part of the key
+        terms = lookup_terms(query)
+        if not terms:
+            return []
+
+        with self._cache_lock:
+            cached = self._cache.get(terms)
+            if cached is not None:
+                self._cache.move_to_end(terms)
+                return cached
+
+        with self.pool.session() as session:
+            result = session.run(LOOKUP_QUERY, terms=list(terms), text=" ".join(terms), limit=self.limit)
+            commands = [{"command": record["command"],
+                         "description": record["description"],
+                         "safe": record["safe"]} for record in result]
+
+        with self._cache_lock:
+            self._cache[terms] = commands
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return commands
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    def close(self):
+        self.pool.close()
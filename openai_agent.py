@@ -1,12 +1,11 @@
-import json
-from openai import OpenAI
 from agents.base_agent import BaseDockerAgent
 from Tool.agent_tool import doc_qa_tool, run_command_tool
-from config import OPENAI_API_KEY
+from llm_clients import get_openai_client
+from tool_dispatch import dispatch_tool_calls
 
 class OpenAIDockerAgent(BaseDockerAgent):
     def setup(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_openai_client()
         
         self.tools = [
             {
@@ -44,6 +43,11 @@ class OpenAIDockerAgent(BaseDockerAgent):
                 }
             }
         ]
+        
+        self.tool_handlers = {
+            "docker_docs_search": lambda args: doc_qa_tool(args["query"], None),
+            "execute_docker_command": lambda args: run_command_tool(args["command"])
+        }
     
     def run(self, query: str) -> str:
         try:
@@ -80,23 +84,8 @@ Always explain what each command does before executing it."""
             if message.tool_calls:
                 messages.append(message)
                 
-                for tool_call in message.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    if function_name == "docker_docs_search":
-                        function_response = doc_qa_tool(function_args["query"], None)
-                    elif function_name == "execute_docker_command":
-                        function_response = run_command_tool(function_args["command"])
-                    else:
-                        function_response = "Unknown function"
-                    
-                    messages.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": function_response
-                    })
+                # Independent calls run concurrently; results keep the model's order
+                messages.extend(dispatch_tool_calls(message.tool_calls, self.tool_handlers))
                 
                 # Get final response
                 second_response = self.client.chat.completions.create(
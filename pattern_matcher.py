@@ -0,0 +1,95 @@
+"""
+Pattern matcher - Aho-Corasick automaton over the trigger phrases of every pattern
+
+The automaton is built once, so matching a query costs one pass over its
+characters however many patterns are loaded. Triggers only match on word
+boundaries ("ps" does not fire inside "apps"). When several patterns match,
+the highest priority wins, then the longest trigger, then file order.
+
+Pattern file format (JSON):
+
+    {
+        "patterns": [
+            {
+                "name": "list_containers",
+                "triggers": ["list containers", "ps"],
+                "command": "docker ps",
+                "safe": true,
+                "priority": 0
+            }
+        ]
+    }
+"""
+import json
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PatternMatcher:
+    """Compiled multi-pattern trigger matcher"""
+
+    def __init__(self, patterns: List[Dict[str, Any]]):
+        self.patterns = patterns
+        # Trie nodes: transitions, failure link and (pattern index, trigger length) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Tuple[int, int]]] = [[]]
+
+        for index, pattern in enumerate(patterns):
+            for trigger in pattern["triggers"]:
+                self._add(" ".join(trigger.lower().split()), index)
+        self._link()
+
+    @classmethod
+    def from_file(cls, path: str) -> 'PatternMatcher':
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["patterns"])
+
+    def _add(self, trigger: str, index: int):
+        node = 0
+        for char in trigger:
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._outputs[node].append((index, len(trigger)))
+
+    def _link(self):
+        """Breadth-first failure links; each node also inherits its suffix's outputs"""
+        # Depth-1 nodes keep their link to the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def matches(self, query: str) -> List[Tuple[int, int, int]]:
+        """Every (pattern index, start, end) whose trigger appears in `query` on word boundaries"""
+        text = " ".join(query.lower().split())
+        found = []
+        node = 0
+        for end, char in enumerate(text, 1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index, length in self._outputs[node]:
+                start = end - length
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    found.append((index, start, end))
+        return found
+
+    def match(self, query: str) -> Optional[Dict[str, Any]]:
+        """The winning pattern for `query`, or None"""
+        best = None
+        for index, start, end in self.matches(query):
+            key = (self.patterns[index].get("priority", 0), end - start, -index)
+            if best is None or key > best[0]:
+                best = (key, index)
+        return self.patterns[best[1]] if best else None
@@ -0,0 +1,144 @@
+"""
+DockerKnowledgeGraph against an in-process Neo4j stand-in
+
+FakeDriver understands the handful of statements neo4j_graph sends (schema
+marker, seed, lookup) and answers them from plain dicts, counting every
+statement so tests can tell cache hits from database round trips.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neo4j_graph import (DockerKnowledgeGraph, LOOKUP_QUERY, SCHEMA_STATEMENTS, SCHEMA_VERSION,  # noqa: E402
+                         SEED_QUERY, lookup_terms)
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+    def consume(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.schema_version = None
+        self.commands = {}
+        self.intents = {}
+        self.statements = []
+        self.sessions_opened = 0
+
+    def run(self, query, **params):
+        self.statements.append(query)
+        if "RETURN m.version" in query:
+            return FakeResult([{"version": self.schema_version}] if self.schema_version is not None else [])
+        if query.lstrip().startswith("MERGE (m:SchemaMarker"):
+            self.schema_version = params["version"]
+        elif query is SEED_QUERY:
+            self.commands = {command["name"]: command for command in params["commands"]}
+            self.intents = {intent["name"]: intent["commands"] for intent in params["intents"]}
+        elif query is LOOKUP_QUERY:
+            return FakeResult(self._lookup(params["terms"], params["text"])[:params["limit"]])
+        return FakeResult()
+
+    def _lookup(self, terms, text):
+        scores = {}
+        for term in terms:
+            for name in self.intents.get(term, []):
+                scores[name] = max(scores.get(name, 0.0), 2.0)
+        words = set(text.split())
+        for name, command in self.commands.items():
+            matched = len(words & set(command["description"].lower().split()))
+            if matched:
+                scores[name] = max(scores.get(name, 0.0), float(matched))
+        return [{"command": name, "description": self.commands[name]["description"],
+                 "safe": self.commands[name]["safe"], "score": score}
+                for name, score in sorted(scores.items(), key=lambda item: -item[1])]
+
+    def lookups(self):
+        return sum(1 for statement in self.statements if statement is LOOKUP_QUERY)
+
+
+class FakeSession:
+    def __init__(self, database):
+        self.database = database
+        database.sessions_opened += 1
+
+    def run(self, query, **params):
+        return self.database.run(query, **params)
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self, database=None):
+        self.database = database or FakeDatabase()
+
+    def session(self):
+        return FakeSession(self.database)
+
+
+def test_schema_is_applied_once_then_skipped():
+    driver = FakeDriver()
+    graph = DockerKnowledgeGraph(driver)
+
+    assert graph.ensure_schema() is True
+    assert driver.database.schema_version == SCHEMA_VERSION
+    applied = len(driver.database.statements)
+    assert all(statement in driver.database.statements for statement in SCHEMA_STATEMENTS)
+
+    # Same graph and a fresh agent on the same database both see the marker
+    assert graph.ensure_schema() is False
+    assert DockerKnowledgeGraph(driver).ensure_schema() is False
+    assert len(driver.database.statements) == applied + 2
+
+
+def test_rephrasings_share_one_cache_entry():
+    driver = FakeDriver()
+    graph = DockerKnowledgeGraph(driver)
+    graph.ensure_schema()
+
+    assert lookup_terms("list all my containers") == lookup_terms("Could you list the containers please?")
+    first = graph.find_commands("list all my containers")
+    second = graph.find_commands("Could you list the containers please?")
+
+    assert first == second
+    assert [command["command"] for command in first][:2] == ["ps", "images"]
+    assert driver.database.lookups() == 1
+
+
+def test_query_without_known_terms_skips_the_database():
+    driver = FakeDriver()
+    graph = DockerKnowledgeGraph(driver)
+    graph.ensure_schema()
+
+    assert graph.find_commands("what about the weather today") == []
+    assert driver.database.lookups() == 0
+
+
+def test_reseeding_invalidates_cached_lookups():
+    driver = FakeDriver()
+    graph = DockerKnowledgeGraph(driver)
+    graph.ensure_schema()
+    graph.find_commands("stop container")
+    graph.find_commands("stop container")
+    assert driver.database.lookups() == 1
+
+    # Database wiped and seeded again: cached answers may no longer hold
+    driver.database.schema_version = None
+    assert graph.ensure_schema() is True
+    graph.find_commands("stop container")
+    assert driver.database.lookups() == 2
+
+
+def test_sessions_are_reused_across_lookups():
+    driver = FakeDriver()
+    graph = DockerKnowledgeGraph(driver, pool_size=2)
+    graph.ensure_schema()
+    for query in ("list containers", "create container", "stop container", "remove container"):
+        graph.find_commands(query)
+
+    assert driver.database.sessions_opened == 1
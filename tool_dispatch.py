@@ -0,0 +1,142 @@
+"""
+Tool dispatch - Runs the tool calls of one assistant turn concurrently
+
+Read-only calls run side by side. A call that changes Docker state runs on
+its own, after every call the model issued before it and before every call
+it issued after it, so "docker stop x" then "docker rm x" keep their order.
+"""
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List
+
+from opentelemetry import context as otel_context, trace
+
+from config import (TOOL_CALL_MAX_WORKERS, TOOL_CALL_DEFAULT_TIMEOUT, TOOL_CALL_TIMEOUTS,
+                    TOOL_CALL_COMMAND_ARGUMENTS)
+
+logger = logging.getLogger(__name__)
+tracer = trace.get_tracer(__name__)
+
+# Shared by every agent so concurrent turns can't multiply the thread count
+_executor = ThreadPoolExecutor(max_workers=TOOL_CALL_MAX_WORKERS, thread_name_prefix="tool-call")
+
+# Subcommands that change containers, images, volumes or networks
+MUTATING_COMMAND = re.compile(
+    r"\bdocker(?:-compose|\s+compose)?\s+(?:(?:container|image|volume|network|system|builder)\s+)?"
+    r"(?:run|create|start|stop|restart|kill|pause|unpause|rm|rmi|prune|pull|push|build|load|import|"
+    r"commit|tag|untag|rename|update|up|down|exec|cp|login|logout)\b",
+    re.IGNORECASE
+)
+
+
+def _is_mutating(tool_call: Any) -> bool:
+    """True if the call runs a command that can change Docker state"""
+    field = TOOL_CALL_COMMAND_ARGUMENTS.get(tool_call.function.name)
+    if not field:
+        return False
+    try:
+        command = json.loads(tool_call.function.arguments or "{}").get(field, "")
+    except (ValueError, AttributeError):
+        # Can't tell what it runs; don't let it race anything
+        return True
+    return bool(MUTATING_COMMAND.search(str(command)))
+
+
+def _batches(tool_calls: List[Any]) -> List[List[Any]]:
+    """Runs of read-only calls, with every state-changing call in a batch of its own"""
+    batches, batch = [], []
+    for tool_call in tool_calls:
+        if _is_mutating(tool_call):
+            if batch:
+                batches.append(batch)
+            batches.append([tool_call])
+            batch = []
+        else:
+            batch.append(tool_call)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _call_tool(handler: Callable[[Dict[str, Any]], str], arguments: str, span: Dict[str, Any],
+               parent: otel_context.Context) -> str:
+    # Pool threads don't inherit the caller's context; parent the span explicitly
+    with tracer.start_as_current_span(f"tool {span['tool']}", context=parent, attributes={
+        'tool.name': span['tool'],
+        'tool.call_id': span['tool_call_id']
+    }):
+        span['started_at'] = time.time()
+        try:
+            return str(handler(json.loads(arguments or "{}")))
+        finally:
+            span['finished_at'] = time.time()
+
+
+def dispatch_tool_calls(tool_calls: List[Any],
+                        handlers: Dict[str, Callable[[Dict[str, Any]], str]]) -> List[Dict[str, Any]]:
+    """
+    Execute the tool calls, read-only ones concurrently, and return the tool
+    messages in the order the model issued them. Each call gets an
+    OpenTelemetry span under a "tool_calls" span.
+    """
+    call_spans: List[Dict[str, Any]] = []
+    with tracer.start_as_current_span("tool_calls", attributes={'tool.count': len(tool_calls)}) as turn_span:
+        messages = []
+        for batch in _batches(tool_calls):
+            messages.extend(_dispatch(batch, handlers, call_spans, otel_context.get_current()))
+        turn_span.set_attribute('tool.timeouts', sum(1 for span in call_spans if span['status'] == 'timeout'))
+    return messages
+
+
+def _dispatch(tool_calls: List[Any],
+              handlers: Dict[str, Callable[[Dict[str, Any]], str]],
+              spans: List[Dict[str, Any]],
+              parent: otel_context.Context) -> List[Dict[str, Any]]:
+    submitted_at = time.time()
+    pending = []
+    for tool_call in tool_calls:
+        name = tool_call.function.name
+        span = {
+            'tool': name,
+            'tool_call_id': tool_call.id,
+            'submitted_at': submitted_at,
+            'timeout': TOOL_CALL_TIMEOUTS.get(name, TOOL_CALL_DEFAULT_TIMEOUT)
+        }
+        handler = handlers.get(name)
+        future = _executor.submit(_call_tool, handler, tool_call.function.arguments, span, parent) if handler else None
+        pending.append((tool_call, span, future))
+
+    messages = []
+    for tool_call, span, future in pending:
+        if future is None:
+            content, span['status'] = "Unknown function", 'unknown'
+            span['started_at'] = span['finished_at'] = submitted_at
+        else:
+            try:
+                # Every call's budget runs from submission, not from when we got to it
+                content = future.result(timeout=max(0.0, submitted_at + span['timeout'] - time.time()))
+                span['status'] = 'ok'
+            except FutureTimeoutError:
+                content = f"Error: {span['tool']} timed out after {span['timeout']}s"
+                span['status'] = 'timeout'
+            except Exception as e:
+                content = f"Error: {e}"
+                span['status'] = 'error'
+                span['error'] = str(e)
+
+        span['duration'] = span.get('finished_at', time.time()) - span.get('started_at', submitted_at)
+        logger.info("Tool call %s (%s) %s in %.3fs", span['tool'], span['tool_call_id'],
+                    span['status'], span['duration'])
+        spans.append(span)
+
+        messages.append({
+            "tool_call_id": tool_call.id,
+            "role": "tool",
+            "name": tool_call.function.name,
+            "content": content
+        })
+
+    return messages